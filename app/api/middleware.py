@@ -1,59 +1,88 @@
-import json
 import structlog
-import logging
 from fastapi import FastAPI, Request
 from time import time
 from pathlib import Path
 from starlette.responses import JSONResponse
 from app.utils.config_loader import CONFIG
+from app.questions import load_questions
 from contextlib import asynccontextmanager
 import asyncio
+import itertools
+import random
 import numpy as np
-from datetime import datetime
-from filelock import FileLock
-
-# Configure structlog for JSON logging
-structlog.configure(
-    processors=[
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.stdlib.add_log_level,
-        structlog.processors.JSONRenderer()
-    ],
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
-
-# Configure standard logging
-logging_config = CONFIG.get('logging', {})
-log_level = getattr(logging, logging_config.get('level', 'INFO').upper(), logging.INFO)
-logging.basicConfig(level=log_level, handlers=[logging.StreamHandler()])
+import orjson
+from datetime import datetime, timezone
+from typing import List
+
+# Configure structlog for JSON logging, once per process
+if not structlog.is_configured():
+    structlog.configure(
+        processors=[
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.stdlib.add_log_level,
+            structlog.processors.JSONRenderer()
+        ],
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+
+# Standard logging handlers are configured once in app.utils.config_loader
 logger = structlog.get_logger(__name__)
+metrics_logger = structlog.get_logger("metrics")
+performance_logger = structlog.get_logger("performance")
+
+# Metrics store path
+PERFORMANCE_METRICS_FILE = Path(CONFIG.get('monitoring', {}).get('performance_metrics_file', 'performance_metrics.jsonl'))
+
+class LatencyReservoir:
+    """Uniform sample of at most `size` latencies (Algorithm R) with exact count, sum, min and max."""
+    __slots__ = ("size", "samples", "count", "total", "min", "max")
+
+    def __init__(self, size: int):
+        # Samples grow with traffic up to `size`, so rarely hit keys stay small
+        self.size = size
+        self.samples: List[float] = []
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def add(self, latency: float):
+        if self.count < self.size:
+            self.samples.append(latency)
+        else:
+            j = random.randrange(self.count + 1)
+            if j < self.size:
+                self.samples[j] = latency
+        self.count += 1
+        self.total += latency
+        if latency < self.min:
+            self.min = latency
+        if latency > self.max:
+            self.max = latency
+
+    def values(self) -> np.ndarray:
+        return np.asarray(self.samples, dtype=np.float64)
+
+# In-memory request metrics, keyed by "method:endpoint:status". Updated on the
+# event loop without awaiting, so no lock is needed; only the aggregation task
+# touches the disk.
+LATENCY_RESERVOIR_SIZE = CONFIG.get('monitoring', {}).get('latency_reservoir_size', 1024)
+REQUEST_COUNT: dict[str, int] = {}
+ERROR_COUNT: dict[str, int] = {}
+LATENCIES: dict[str, LatencyReservoir] = {}
+# All requests of the interval feed one reservoir, so the aggregated p95 weighs
+# every request equally regardless of how many keys it is spread over
+GLOBAL_LATENCY = LatencyReservoir(LATENCY_RESERVOIR_SIZE)
+
+# Log every Nth successful request; errors are always logged
+LOG_SAMPLE_RATE = max(1, CONFIG.get('monitoring', {}).get('log_sample_rate', 100))
+_log_counter = itertools.count()
 
-# Metrics file paths
-METRICS_FILE = Path(CONFIG.get('monitoring', {}).get('metrics_file', 'metrics.json'))
-PERFORMANCE_METRICS_FILE = Path(CONFIG.get('monitoring', {}).get('performance_metrics_file', 'performance_metrics.json'))
-
-# Lock file paths
-METRICS_LOCK = METRICS_FILE.with_suffix('.lock')
-PERFORMANCE_METRICS_LOCK = PERFORMANCE_METRICS_FILE.with_suffix('.lock')
-
-# Initialize metrics file if it doesn't exist
-if not METRICS_FILE.exists():
-    with FileLock(METRICS_LOCK):
-        with open(METRICS_FILE, 'w') as f:
-            json.dump({
-                "request_count": {},
-                "request_latency": {},
-                "error_count": {}
-            }, f, indent=2)
-
-# Initialize performance metrics file if it doesn't exist
-if not PERFORMANCE_METRICS_FILE.exists():
-    with FileLock(PERFORMANCE_METRICS_LOCK):
-        with open(PERFORMANCE_METRICS_FILE, 'w') as f:
-            json.dump([], f, indent=2)
+# Initialize performance metrics file (JSON Lines, append-only) if it doesn't exist
+PERFORMANCE_METRICS_FILE.touch(exist_ok=True)
 
 async def track_metrics(request: Request, call_next):
     start_time = time()
@@ -68,132 +97,108 @@ async def track_metrics(request: Request, call_next):
         logger.error("Request failed", error=str(e))
         raise
 
-    # Update metrics in file
+    # Update in-memory metrics
     try:
-        with FileLock(METRICS_LOCK):
-            with open(METRICS_FILE, 'r') as f:
-                metrics = json.load(f)
-            
-            key = f"{method}:{endpoint}:{status}"
-            
-            # Update request count
-            metrics["request_count"][key] = metrics["request_count"].get(key, 0) + 1
-            
-            # Update latency
-            latency = time() - start_time
-            metrics["request_latency"].setdefault(key, [])
-            metrics["request_latency"][key].append(latency)
-            
-            # Update error count if applicable
-            if status >= 400:
-                metrics["error_count"][key] = metrics["error_count"].get(key, 0) + 1
+        key = f"{method}:{endpoint}:{status}"
+        latency = time() - start_time
 
-            # Write back to file
-            with open(METRICS_FILE, 'w') as f:
-                json.dump(metrics, f, indent=2)
-        
-        # Log metrics update to metrics-specific logger
-        metrics_logger = structlog.get_logger("metrics")
-        metrics_logger.info(
-            "Metrics updated",
-            method=method,
-            endpoint=endpoint,
-            status=status,
-            latency=latency
-        )
+        REQUEST_COUNT[key] = REQUEST_COUNT.get(key, 0) + 1
+        reservoir = LATENCIES.get(key)
+        if reservoir is None:
+            reservoir = LATENCIES[key] = LatencyReservoir(LATENCY_RESERVOIR_SIZE)
+        reservoir.add(latency)
+        GLOBAL_LATENCY.add(latency)
+        if status >= 400:
+            ERROR_COUNT[key] = ERROR_COUNT.get(key, 0) + 1
+
+        # Log metrics update to metrics-specific logger (sampled)
+        if status >= 400 or next(_log_counter) % LOG_SAMPLE_RATE == 0:
+            metrics_logger.info(
+                "Metrics updated",
+                method=method,
+                endpoint=endpoint,
+                status=status,
+                latency=latency
+            )
     except Exception as e:
         logger.error("Failed to update metrics", error=str(e))
 
     return response
 
+def _flush_performance_metrics(row: dict):
+    """Append the aggregated row; blocking, so run off the event loop."""
+    with open(PERFORMANCE_METRICS_FILE, 'ab') as f:
+        f.write(orjson.dumps(row, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n")
+
 async def aggregate_performance_metrics():
+    global REQUEST_COUNT, ERROR_COUNT, LATENCIES, GLOBAL_LATENCY
     interval = CONFIG.get('monitoring', {}).get('performance_aggregation_interval', 60)  # Default: 60 seconds
     while True:
         try:
-            # Read metrics with lock
-            with FileLock(METRICS_LOCK):
-                with open(METRICS_FILE, 'r') as f:
-                    metrics = json.load(f)
-            
-            # Read performance metrics with lock
-            with FileLock(PERFORMANCE_METRICS_LOCK):
-                with open(PERFORMANCE_METRICS_FILE, 'r') as f:
-                    perf_metrics = json.load(f)
-            
-            # Calculate performance metrics
-            timestamp = datetime.utcnow().isoformat()
-            request_count = sum(metrics["request_count"].values())
-            error_count = sum(metrics["error_count"].values())
-            latencies = []
-            for latency_list in metrics["request_latency"].values():
-                latencies.extend(latency_list)
-            
-            if not latencies:
-                await asyncio.sleep(interval)
-                continue
-            
-            avg_latency = sum(latencies) / len(latencies)
-            min_latency = min(latencies)
-            max_latency = max(latencies)
-            p95_latency = np.percentile(latencies, 95) if latencies else 0.0
-            throughput = request_count / interval  # Requests per second
-            error_rate = error_count / request_count if request_count > 0 else 0.0
-            
-            # Append to performance metrics
-            perf_metrics.append({
-                "timestamp": timestamp,
-                "request_count": request_count,
-                "throughput": throughput,
-                "avg_latency": avg_latency,
-                "min_latency": min_latency,
-                "max_latency": max_latency,
-                "p95_latency": p95_latency,
-                "error_rate": error_rate
-            })
-            
-            # Write back to performance metrics file with lock
-            with FileLock(PERFORMANCE_METRICS_LOCK):
-                with open(PERFORMANCE_METRICS_FILE, 'w') as f:
-                    json.dump(perf_metrics, f, indent=2)
-            
-            # Log performance metrics
-            perf_logger = structlog.get_logger("performance")
-            perf_logger.info(
-                "Performance metrics aggregated",
-                timestamp=timestamp,
-                request_count=request_count,
-                throughput=throughput,
-                avg_latency=avg_latency,
-                min_latency=min_latency,
-                max_latency=max_latency,
-                p95_latency=p95_latency,
-                error_rate=error_rate
-            )
-            
-            # Reset metrics file to avoid unbounded growth
-            with FileLock(METRICS_LOCK):
-                with open(METRICS_FILE, 'w') as f:
-                    json.dump({
-                        "request_count": {},
-                        "request_latency": {},
-                        "error_count": {}
-                    }, f, indent=2)
+            # Swap out the in-memory counters for this interval (no await in between)
+            request_counts, error_counts, latencies = REQUEST_COUNT, ERROR_COUNT, GLOBAL_LATENCY
+            REQUEST_COUNT, ERROR_COUNT, LATENCIES = {}, {}, {}
+            GLOBAL_LATENCY = LatencyReservoir(LATENCY_RESERVOIR_SIZE)
+
+            # Calculate performance metrics; avg/min/max are exact, p95 comes from the reservoir
+            if latencies.count:
+                request_count = sum(request_counts.values())
+                error_count = sum(error_counts.values())
+                row = {
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "request_count": request_count,
+                    "throughput": request_count / interval,  # Requests per second
+                    "avg_latency": latencies.total / latencies.count,
+                    "min_latency": latencies.min,
+                    "max_latency": latencies.max,
+                    "p95_latency": float(np.percentile(latencies.values(), 95)),
+                    "error_rate": error_count / request_count if request_count > 0 else 0.0
+                }
+                await asyncio.to_thread(_flush_performance_metrics, row)
+
+                # Log performance metrics
+                performance_logger.info("Performance metrics aggregated", **row)
             
         except Exception as e:
             logger.error("Failed to aggregate performance metrics", error=str(e))
         
         await asyncio.sleep(interval)
 
+async def refresh_question_bank(get_service):
+    """Expire the memoized question bank every CACHE_TTL seconds and rebuild the service's view if it changed."""
+    ttl = CONFIG['CACHE_TTL']
+    while True:
+        await asyncio.sleep(ttl)
+        load_questions.cache_clear()
+        try:
+            # Reloading and refitting TF-IDF are blocking, so run them off the event loop.
+            # get_service also retries building the service if the startup warm-up failed
+            service = await asyncio.to_thread(get_service)
+            await asyncio.to_thread(service.refresh_bank)
+        except Exception as e:
+            logger.error("Failed to refresh question bank", error=str(e))
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Startup: build the question service (bank load, indexes, TF-IDF fit) once per
+    # worker before serving, instead of on the first request
+    from app.api.routes import get_question_service  # routes -> services -> this module
+    try:
+        await asyncio.to_thread(get_question_service)
+    except Exception as e:
+        # Keep serving: /health reports the unavailable bank, and the service is built
+        # again on the next request or refresh
+        logger.error("Failed to warm up question service", error=str(e))
     # Startup: Start the performance metrics aggregation task
     task = asyncio.create_task(aggregate_performance_metrics())
+    refresher = asyncio.create_task(refresh_question_bank(get_question_service))
     try:
         yield
     finally:
-        # Shutdown: Cancel the aggregation task
-        task.cancel() 
-        try:
-            await task
-        except asyncio.CancelledError:
-            pass
\ No newline at end of file
+        # Shutdown: Cancel the aggregation and refresh tasks
+        for background in (task, refresher):
+            background.cancel()
+            try:
+                await background
+            except asyncio.CancelledError:
+                pass
\ No newline at end of file
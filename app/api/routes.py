@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, Query
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from fastapi.staticfiles import StaticFiles
 from starlette.requests import Request
 from app.api.models import (
@@ -16,14 +17,25 @@ from app.api.models import (
 from app.services.question_service import QuestionService
 from app.services.infra_service import InfraService
 from typing import List
+from functools import lru_cache
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+# Dashboard templates never change at runtime: skip mtime checks, keep every compiled
+# template, and persist bytecode so restarted workers don't re-parse
+templates = Jinja2Templates(env=Environment(
+    loader=FileSystemLoader("app/templates"),
+    autoescape=True,
+    auto_reload=False,
+    cache_size=-1,
+    bytecode_cache=FileSystemBytecodeCache()
+))
 router.mount("/static", StaticFiles(directory="/app/app/static"), name="static")
 
+@lru_cache(maxsize=1)
 def get_question_service():
     return QuestionService()
 
+@lru_cache(maxsize=1)
 def get_infra_service():
     return InfraService()
 
@@ -35,7 +47,8 @@ def get_infra_service():
     description="Returns a list of all available questions in dataset."
 )
 async def get_questions(service: QuestionService = Depends(get_question_service)):
-    return service.get_all_questions()
+    # The body is pre-serialized per bank load; response_model above still documents it
+    return Response(content=service.get_all_questions_body(), media_type="application/json")
 
 @router.post(
     "/generate",
@@ -64,12 +77,13 @@ async def generate_questions_post(
     request: GenerateQuestionsRequest,
     service: QuestionService = Depends(get_question_service)
 ):
-    return service.generate_quiz(
+    # Plain dicts straight to orjson; response_model above still documents the shape
+    return ORJSONResponse(service.generate_quiz_payload(
         request.goal,
         request.difficulty,
         request.num_questions,
         request.mode
-    )
+    ))
 
 @router.post(
     "/goals",
@@ -98,10 +112,11 @@ async def generate_questions_post(
         "- Requires a valid API token stored in api_tokens.json.\n"
     )
 )
-async def manage_goals(
+def manage_goals(
     request: GoalRequest,
     service: QuestionService = Depends(get_question_service)
 ):
+    # Plain def: file locks and config/bank rewrites run in the threadpool, off the event loop
     if request.action == "add":
         return service.add_goal(request.goal, request.questions, request.api_token)
     elif request.action == "remove":
@@ -127,19 +142,20 @@ async def manage_goals(
         "- If `visualize=true`, returns an HTML page with charts.\n"
     )
 )
-async def health_check(
+def health_check(
     request: Request,
     visualize: bool = Query(False, description="Return visualization dashboard if true"),
     service: InfraService = Depends(get_infra_service)
 ):
-    health_response = service.health_check()
+    # Plain def: may reload the bank or read the metrics file, so it runs in the threadpool
     if visualize:
+        health_response = service.health_check()
         chart_data = service.get_health_chart_data()
         return templates.TemplateResponse(
             "health_visualization.html",
             {"request": request, "health": health_response, "chart_data": chart_data}
         )
-    return health_response
+    return Response(content=service.health_check_body(), media_type="application/json")
 
 @router.get(
     "/config",
@@ -160,7 +176,7 @@ async def health_check(
     )
 )
 async def get_config(service: QuestionService = Depends(get_question_service)):
-    return service.get_config()
+    return Response(content=service.get_config_body(), media_type="application/json")
 
 @router.get(
     "/local-metrics",
@@ -179,5 +195,6 @@ async def local_metrics(service: InfraService = Depends(get_infra_service)):
     summary="Performance metrics",
     description="Exposes aggregated performance metrics including throughput, latency statistics, and error rates."
 )
-async def performance_metrics(service: InfraService = Depends(get_infra_service)):
+def performance_metrics(service: InfraService = Depends(get_infra_service)):
+    # Plain def: reads the metrics file, so it runs in the threadpool
     return service.get_performance_metrics()
\ No newline at end of file
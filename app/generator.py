@@ -1,18 +1,19 @@
-import json
+import itertools
+import logging
+import mmap
+import orjson
+import re
 import string
+from functools import lru_cache
 from typing import List, Dict, Optional
 import nltk
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
 import numpy as np
 from pathlib import Path
 
-# Download NLTK data (ensure this is done once during setup)
-nltk.download('stopwords', quiet=True)
-nltk.download('punkt', quiet=True)
-nltk.download('punkt_tab',quiet=True)
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+
+logger = logging.getLogger(__name__)
 
 # Configuration constants
 CONFIG = {
@@ -24,6 +25,25 @@ CONFIG = {
     "MAX_QUESTIONS": 10,
     "MIN_QUESTIONS": 5
 }
+
+_PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+_WORD_RE = re.compile(r"\w+")
+
+@lru_cache(maxsize=None)
+def _load_stopwords() -> frozenset:
+    """English stopwords, loaded once per process; only hits the network if the corpus isn't installed."""
+    try:
+        return frozenset(stopwords.words('english'))
+    except LookupError:
+        nltk.download('stopwords', quiet=True)
+        return frozenset(stopwords.words('english'))
+
+def _analyze(text: str) -> List[str]:
+    """Lowercase, strip punctuation, and keep alphabetic tokens of two or more characters that aren't stopwords."""
+    stop_words = _load_stopwords()
+    tokens = _WORD_RE.findall(text.lower().translate(_PUNCTUATION_TABLE))
+    return [t for t in tokens if len(t) > 1 and t.isalpha() and t not in stop_words]
+
 class QuizGenerator:
     def __init__(self, data_path: str, config_path: str):
         """
@@ -33,15 +53,17 @@ class QuizGenerator:
             data_path (str): Path to the question bank JSON file.
             config_path (str): Path to the config.json file.
         """
-        self.stop_words = set(stopwords.words('english'))
+        self.stop_words = _load_stopwords()
         self.data_path = Path(data_path)
         self.config_path = Path(config_path)
+        # Sequential quiz ids instead of a random draw that collides after a few thousand quizzes
+        self._quiz_ids = itertools.count(1)
         
         # Load configuration
         if not self.config_path.exists():
             raise FileNotFoundError("config.json is missing")
-        with open(self.config_path, 'r') as f:
-            self.config = json.load(f)
+        with open(self.config_path, 'rb') as f:
+            self.config = orjson.loads(f.read())
         
         # Validate configuration
         self.max_questions = self.config.get('max_questions', 10)
@@ -52,51 +74,48 @@ class QuizGenerator:
         # Load question bank
         if not self.data_path.exists():
             raise FileNotFoundError("Question bank JSON is missing")
-        with open(self.data_path, 'r',encoding='utf-8') as f:
-            self.question_bank = json.load(f)['quizzes']
+        # Parse straight from a read-only mapping to avoid an intermediate bytes copy
+        with open(self.data_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                self.question_bank = orjson.loads(view)['quizzes']
         
         # Preprocess questions and build TF-IDF model
         self.documents = []
         self.metadata = []
         self._prepare_documents()
-        self.vectorizer = TfidfVectorizer(max_features=5000)
-        self.tfidf_matrix = self.vectorizer.fit_transform(self.documents)
-        print("tfidf_matrix",self.tfidf_matrix)
-        
-    def _preprocess_text(self, text: str) -> str:
-        """
-        Preprocess text by tokenizing, removing stopwords, and cleaning.
+        # Feature hashing avoids building a vocabulary; IDF weighting is applied on top.
+        # _analyze runs inside the vectorizer for documents and queries alike.
+        # norm='l2' makes every row (and every transformed query) unit length, so
+        # cosine similarity reduces to a plain sparse dot product. float32 halves the
+        # bytes each sparse mat-vec has to move
+        self.vectorizer = HashingVectorizer(n_features=2**14, alternate_sign=False, norm=None,
+                                            analyzer=_analyze, dtype=np.float32)
+        counts = self.vectorizer.transform(self.documents)
+        self.tfidf = TfidfTransformer(norm='l2').fit(counts)
+        self.tfidf_matrix = self.tfidf.transform(counts)
+        # Rows must be unit length (or empty) for the dot product to equal cosine similarity
+        norms = np.sqrt(np.asarray(self.tfidf_matrix.multiply(self.tfidf_matrix).sum(axis=1)).ravel())
+        if not np.all((np.abs(norms - 1) < 1e-4) | (norms == 0)):
+            raise ValueError("TF-IDF rows are not L2-normalized")
+        logger.debug("TF-IDF matrix shape: %s", self.tfidf_matrix.shape)
         
-        Args:
-            text (str): Input text to preprocess.
-        
-        Returns:
-            str: Processed text.
-        """
-        # Convert to lowercase
-        text = text.lower()
-        # Remove punctuation
-        text = text.translate(str.maketrans('', '', string.punctuation))
-        # Tokenize
-        tokens = word_tokenize(text)
-        # Remove stopwords and non-alphabetic tokens
-        tokens = [t for t in tokens if t.isalpha() and t not in self.stop_words]
-        return ' '.join(tokens)
-    
     def _prepare_documents(self):
         """
         Prepare documents for TF-IDF by combining question, goal, and topic.
-        Store metadata for retrieval.
+        Store metadata for retrieval and index rows by (goal, difficulty) and
+        (goal, difficulty, topic), lowercased.
         """
+        self.documents = [
+            ' '.join((question['question'], quiz['goal'], question.get('topic', '')))
+            for quiz in self.question_bank for question in quiz['questions']
+        ]
+        group_index = {}
+        topic_index = {}
         for quiz in self.question_bank:
             goal = quiz['goal']
             q_type = quiz['type']
             for question in quiz['questions']:
-                # Combine question text, goal, and topic for better context
-                text = question['question']
                 topic = question.get('topic', '')
-                doc = f"{text} {goal} {topic}"
-                self.documents.append(self._preprocess_text(doc))
                 self.metadata.append({
                     'goal': goal,
                     'type': q_type,
@@ -106,6 +125,12 @@ class QuizGenerator:
                     'difficulty': question['difficulty'],
                     'topic': topic
                 })
+                row = len(self.metadata) - 1
+                key = (goal.lower(), question['difficulty'].lower())
+                group_index.setdefault(key, []).append(row)
+                topic_index.setdefault(key + (topic.lower(),), []).append(row)
+        self._group_index = {key: np.array(rows) for key, rows in group_index.items()}
+        self._topic_index = {key: np.array(rows) for key, rows in topic_index.items()}
     
     def generate_quiz(self, goal: str, num_questions: int, difficulty: str, topic: Optional[str] = None) -> Dict:
         """
@@ -130,42 +155,39 @@ class QuizGenerator:
         query = f"{goal} {difficulty}"
         if topic:
             query += f" {topic}"
-        query = self._preprocess_text(query)
-        print ("query=",query)
+        logger.debug("query=%s", query)
         # Transform query to TF-IDF vector
-        query_vector = self.vectorizer.transform([query])
-        print ("query_vector=",query_vector)
-        # Compute cosine similarity
-        similarities = cosine_similarity(query_vector, self.tfidf_matrix).flatten()
-        print ("similarities=",similarities)
-        # Get top matching questions
-        top_indices = np.argsort(similarities)[::-1]
+        query_vector = self.tfidf.transform(self.vectorizer.transform([query]))
+        logger.debug("query_vector=%s", query_vector)
+        # Restrict to the precomputed (goal, difficulty[, topic]) candidates
+        key = (goal.lower(), difficulty.lower())
+        if topic:
+            candidates = self._topic_index.get(key + (topic.lower(),))
+        else:
+            candidates = self._group_index.get(key)
         selected_questions = []
-        used_indices = set()
-        
-        for idx in top_indices:
-            if len(selected_questions) >= num_questions:
-                break
-            meta = self.metadata[idx]
-            # Apply filters
-            if (meta['goal'].lower() == goal.lower() and 
-                meta['difficulty'].lower() == difficulty.lower() and
-                idx not in used_indices):
-                if topic and meta['topic'].lower() != topic.lower():
-                    continue
-                question = {
-                    'type': meta['type'],
-                    'question': meta['question'],
-                    'options': meta['options'] if meta['type'] == 'mcq' else [],
-                    'answer': meta['answer'],
-                    'difficulty': meta['difficulty'],
-                    'topic': meta['topic']
-                }
-                selected_questions.append(question)
-                used_indices.add(idx)
+        if candidates is not None:
+            # Compute cosine similarity on the candidate rows only
+            similarities = (self.tfidf_matrix[candidates] @ query_vector.T).toarray().ravel()
+            logger.debug("similarities=%s", similarities)
+            # Get top matching questions
+            k = min(len(similarities), num_questions)
+            if k > 0:
+                top = np.argpartition(-similarities, k - 1)[:k]
+                top = top[np.argsort(-similarities[top])]
+                for idx in candidates[top]:
+                    meta = self.metadata[idx]
+                    selected_questions.append({
+                        'type': meta['type'],
+                        'question': meta['question'],
+                        'options': meta['options'] if meta['type'] == 'mcq' else [],
+                        'answer': meta['answer'],
+                        'difficulty': meta['difficulty'],
+                        'topic': meta['topic']
+                    })
         
         # Generate quiz response
-        quiz_id = f"quiz_{np.random.randint(1000, 9999)}"
+        quiz_id = f"quiz_{next(self._quiz_ids):08x}"
         return {
             'quiz_id': quiz_id,
             'goal': goal,
@@ -184,4 +206,4 @@ if __name__ == "__main__":
         difficulty="beginner",
         topic="General Aptitude"
     )
-    print(json.dumps(quiz, indent=2)) 
\ No newline at end of file
+    print(orjson.dumps(quiz, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode())
\ No newline at end of file
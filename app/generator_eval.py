@@ -1,18 +1,18 @@
+import itertools
 import json
+import re
 import string
+import orjson
+from collections import defaultdict
 from typing import List, Dict, Optional
 import nltk
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 from pathlib import Path
 
 # Download NLTK data (ensure this is done once during setup)
 nltk.download('stopwords', quiet=True)
-nltk.download('punkt', quiet=True)
-nltk.download('punkt_tab', quiet=True)
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 
 # Configuration constants
 CONFIG = {
@@ -25,6 +25,9 @@ CONFIG = {
     "MIN_QUESTIONS": 5
 }
 
+_PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+_WORD_RE = re.compile(r"\w+")
+
 class QuizGenerator:
     def __init__(self, data_path: str, config_path: str):
         """
@@ -34,15 +37,17 @@ class QuizGenerator:
             data_path (str): Path to the question bank JSON file.
             config_path (str): Path to the config.json file.
         """
-        self.stop_words = set(stopwords.words('english'))
+        self.stop_words = frozenset(stopwords.words('english'))
         self.data_path = Path(data_path)
         self.config_path = Path(config_path)
+        # Sequential quiz ids instead of a random draw that collides after a few thousand quizzes
+        self._quiz_ids = itertools.count(1)
         
         # Load configuration
         if not self.config_path.exists():
             raise FileNotFoundError("config.json is missing")
-        with open(self.config_path, 'r') as f:
-            self.config = json.load(f)
+        with open(self.config_path, 'rb') as f:
+            self.config = orjson.loads(f.read())
         
         # Validate configuration
         self.max_questions = self.config.get('max_questions', 10)
@@ -53,46 +58,57 @@ class QuizGenerator:
         # Load question bank
         if not self.data_path.exists():
             raise FileNotFoundError("Question bank JSON is missing")
-        with open(self.data_path, 'r', encoding='utf-8') as f:
-            self.question_bank = json.load(f)['quizzes']
+        with open(self.data_path, 'rb') as f:
+            self.question_bank = orjson.loads(f.read())['quizzes']
         
         # Preprocess questions and build TF-IDF model
         self.documents = []
         self.metadata = []
         self._prepare_documents()
-        self.vectorizer = TfidfVectorizer(max_features=5000)
-        self.tfidf_matrix = self.vectorizer.fit_transform(self.documents)
+        # _analyze runs inside the vectorizer for documents and queries alike;
+        # norm='l2' keeps rows unit length, so cosine similarity is a plain dot product;
+        # float32 halves the bytes each sparse mat-vec has to move
+        self.vectorizer = TfidfVectorizer(max_features=5000, analyzer=self._analyze, norm='l2',
+                                          dtype=np.float32)
+        # Fit on distinct documents only (cloned questions share a row), then gather
+        # back into bucket order so the contiguous row ranges still hold
+        unique_ids = {}
+        doc_rows = np.fromiter((unique_ids.setdefault(doc, len(unique_ids)) for doc in self.documents),
+                               dtype=np.int64, count=len(self.documents))
+        self.tfidf_matrix = self.vectorizer.fit_transform(list(unique_ids))[doc_rows]
+        # Rows must be unit length (or empty) for the dot product to equal cosine similarity
+        norms = np.sqrt(np.asarray(self.tfidf_matrix.multiply(self.tfidf_matrix).sum(axis=1)).ravel())
+        if not np.all((np.abs(norms - 1) < 1e-4) | (norms == 0)):
+            raise ValueError("TF-IDF rows are not L2-normalized")
         print("TF-IDF matrix shape:", self.tfidf_matrix.shape)
         
-    def _preprocess_text(self, text: str) -> str:
+    def _analyze(self, text: str) -> List[str]:
         """
-        Preprocess text by tokenizing, removing stopwords, and cleaning.
+        Tokenize text for TF-IDF: lowercase, strip punctuation, and keep alphabetic
+        tokens of two or more characters that are not NLTK English stopwords.
         
         Args:
-            text (str): Input text to preprocess.
+            text (str): Input text to tokenize.
         
         Returns:
-            str: Processed text.
+            List[str]: Tokens.
         """
-        text = text.lower()
-        text = text.translate(str.maketrans('', '', string.punctuation))
-        tokens = word_tokenize(text)
-        tokens = [t for t in tokens if t.isalpha() and t not in self.stop_words]
-        return ' '.join(tokens)
+        tokens = _WORD_RE.findall(text.lower().translate(_PUNCTUATION_TABLE))
+        return [t for t in tokens if len(t) > 1 and t.isalpha() and t not in self.stop_words]
     
     def _prepare_documents(self):
         """
         Prepare documents for TF-IDF by combining question, goal, and topic.
-        Store metadata for retrieval.
+        Store metadata for retrieval, ordered so each (goal, difficulty) bucket is a
+        contiguous row range.
         """
+        buckets = defaultdict(list)
         for quiz in self.question_bank:
             goal = quiz['goal']
             q_type = quiz['type']
             for question in quiz['questions']:
-                text = question['question']
                 topic = question.get('topic', '')
-                doc = f"{text} {goal} {topic}"
-                self.documents.append(self._preprocess_text(doc))
+                self.documents.append(f"{question['question']} {goal} {topic}")
                 self.metadata.append({
                     'goal': goal,
                     'type': q_type,
@@ -102,6 +118,19 @@ class QuizGenerator:
                     'difficulty': question['difficulty'],
                     'topic': topic
                 })
+                buckets[(goal.lower(), question['difficulty'].lower())].append(len(self.metadata) - 1)
+        # Reorder rows bucket by bucket, so scoring a bucket is a CSR row slice
+        # (an indptr view) rather than a fancy-indexed copy
+        order = [row for rows in buckets.values() for row in rows]
+        self.documents = [self.documents[row] for row in order]
+        self.metadata = [self.metadata[row] for row in order]
+        self.bucket_ranges = {}
+        start = 0
+        for key, rows in buckets.items():
+            self.bucket_ranges[key] = (start, start + len(rows))
+            start += len(rows)
+        # Lowercased topics as a parallel array, so topic filtering is one vectorized comparison
+        self.topics_l = np.array([meta['topic'].lower() for meta in self.metadata], dtype=object)
     
     def generate_quiz(self, goal: str, num_questions: int, difficulty: str, topic: Optional[str] = None) -> Dict:
         """
@@ -124,36 +153,34 @@ class QuizGenerator:
         query = f"{goal} {difficulty}"
         if topic:
             query += f" {topic}"
-        query = self._preprocess_text(query)
         
         query_vector = self.vectorizer.transform([query])
-        similarities = cosine_similarity(query_vector, self.tfidf_matrix).flatten()
-        
-        top_indices = np.argsort(similarities)[::-1]
         selected_questions = []
-        used_indices = set()
-        
-        for idx in top_indices:
-            if len(selected_questions) >= num_questions:
-                break
-            meta = self.metadata[idx]
-            if (meta['goal'].lower() == goal.lower() and 
-                meta['difficulty'].lower() == difficulty.lower() and
-                idx not in used_indices):
-                if topic and meta['topic'].lower() != topic.lower():
-                    continue
-                question = {
-                    'type': meta['type'],
-                    'question': meta['question'],
-                    'options': meta['options'] if meta['type'] == 'mcq' else [],
-                    'answer': meta['answer'],
-                    'difficulty': meta['difficulty'],
-                    'topic': meta['topic']
-                }
-                selected_questions.append(question)
-                used_indices.add(idx)
+        bucket = self.bucket_ranges.get((goal.lower(), difficulty.lower()))
+        if bucket is not None and num_questions > 0:
+            # Score only the (goal, difficulty) row range, then narrow to the topic
+            start, end = bucket
+            similarities = (self.tfidf_matrix[start:end] @ query_vector.T).toarray().ravel()
+            candidates = np.arange(start, end)
+            if topic:
+                keep = np.flatnonzero(self.topics_l[start:end] == topic.lower())
+                similarities, candidates = similarities[keep], candidates[keep]
+            k = min(num_questions, len(similarities))
+            if k > 0:
+                top = np.argpartition(-similarities, k - 1)[:k]
+                top = top[np.argsort(-similarities[top])]
+                for idx in candidates[top]:
+                    meta = self.metadata[idx]
+                    selected_questions.append({
+                        'type': meta['type'],
+                        'question': meta['question'],
+                        'options': meta['options'] if meta['type'] == 'mcq' else [],
+                        'answer': meta['answer'],
+                        'difficulty': meta['difficulty'],
+                        'topic': meta['topic']
+                    })
         
-        quiz_id = f"quiz_{np.random.randint(1000, 9999)}"
+        quiz_id = f"quiz_{next(self._quiz_ids):08x}"
         return {
             'quiz_id': quiz_id,
             'goal': goal,
@@ -1,179 +1,196 @@
 import random
-import numpy as np
-from jinja2 import Template
-from sympy import symbols, Eq, solve
+from functools import lru_cache
+import math
 
+# Scalar parameter draws; random.Random is far cheaper per call than NumPy's global RandomState
+_rng = random.Random()
+
+# Thin-airfoil lift slope (2π per radian) expressed per degree
+_LIFT_SLOPE_PER_DEG = 2 * math.pi * math.pi / 180
+
+# Formatted answers for templates whose whole integer input domain is small,
+# precomputed over exactly the ranges their generate_params draw from
+_SUMROOTS = {(a, b): f"{(-b / a):.2f}" for a in range(1, 5) for b in range(-10, 10)}
+_TRIANGLE_AREAS = {(b, h): f"{(0.5 * b * h):.2f}" for b in range(4, 10) for h in range(5, 12)}
+
+def _load_factor(params) -> float:
+    """Load factor of a coordinated turn: sqrt(1 + (V²/gR)²)."""
+    return math.sqrt(1 + (params['V']**2 / (9.81 * params['R']))**2)
+
+def _orbital_velocity(params) -> float:
+    """Circular orbital velocity in km/s at altitude h km above Earth."""
+    return math.sqrt(398600 / (6371 + params['h']))
+
+def _smallest_with_remainders(params) -> int:
+    """Smallest number leaving remainders r1, r2 when divided by d1, d2 (as the template defines it)."""
+    return params['r1'] + params['d1'] * (params['r2'] - params['r1']) // math.gcd(params['d1'], params['d2'])
+
+def _mcq(base, fmt: str, deltas=(-0.2, 0, 0.2, 0.4), correct_idx: int = 1):
+    """Build (answer, options) for a numeric MCQ whose options are offsets from one computed value."""
+    options = [f"{letter}. {base + delta:{fmt}}" for letter, delta in zip("ABCD", deltas)]
+    return options[correct_idx], options
+
+@lru_cache(maxsize=1024)
 def solve_equation(a: int, b: int, c: int) -> str:
     """Solve quadratic equation ax² + bx + c = 0 and return roots as a string. """
-    x = symbols('x')
-    equation = Eq(a*x**2 + b*x + c, 0)
-    roots = solve(equation, x)
-    return ", ".join(str(round(float(root.evalf()), 2)) for root in sorted(roots, key=lambda x: float(x.evalf())))
+    a, b, c = int(a), int(b), int(c)
+    disc = b * b - 4 * a * c
+    if disc < 0:
+        real = round(-b / (2 * a), 2) + 0.0
+        imag = round(math.sqrt(-disc) / (2 * a), 2)
+        return f"{real} - {imag}i, {real} + {imag}i"
+    if disc == 0:
+        return str(round(-b / (2 * a), 2) + 0.0)
+    sqrt_disc = math.sqrt(disc)
+    roots = sorted(((-b - sqrt_disc) / (2 * a), (-b + sqrt_disc) / (2 * a)))
+    return ", ".join(str(round(root, 2) + 0.0) for root in roots)
 
 TEMPLATES = [
     # GATE Templates
     {
-        "template": Template("Solve {{a}}x² + {{b}}x + {{c}} = 0 for x (round to 2 decimal places)."),
+        "template": lambda p: f"Solve {p['a']}x² + {p['b']}x + {p['c']} = 0 for x (round to 2 decimal places).",
         "difficulty": "beginner",
         "topic": "algebra",
         "goal": "GATE",
         "generate_params": lambda: {
-            "a": np.random.randint(1, 6),
-            "b": np.random.randint(-5, 6),
-            "c": np.random.randint(-5, 6)
+            "a": _rng.randint(1, 5),
+            "b": _rng.randint(-5, 5),
+            "c": _rng.randint(-5, 5)
         },
         "compute_answer": lambda params: solve_equation(params["a"], params["b"], params["c"]),
         "options": []
     },
     {
-        "template": Template("The thrust of a jet engine with mass flow rate {{m}} kg/s and exhaust velocity {{v}} m/s is (in kN, to two decimal places):"),
+        "template": lambda p: f"The thrust of a jet engine with mass flow rate {p['m']} kg/s and exhaust velocity {p['v']} m/s is (in kN, to two decimal places):",
         "difficulty": "beginner",
         "topic": "propulsion",
         "goal": "GATE",
         "generate_params": lambda: {
-            "m": np.random.randint(40, 60),
-            "v": np.random.randint(300, 700)
+            "m": _rng.randint(40, 59),
+            "v": _rng.randint(300, 699)
         },
         "compute_answer": lambda params: f"{(params['m'] * params['v'] / 1000):.2f}",
         "options": []
     },
     {
-        "template": Template("The lift coefficient of a wing at {{angle}}° angle of attack is (to two decimal places):"),
+        "template": lambda p: f"The lift coefficient of a wing at {p['angle']}° angle of attack is (to two decimal places):",
         "difficulty": "intermediate",
         "topic": "Aerodynamics",
         "goal": "GATE",
         "generate_params": lambda: {
-            "angle": np.random.randint(2, 8)
+            "angle": _rng.randint(2, 7)
         },
-        "compute_answer": lambda params: f"B. {(2 * np.pi * params['angle'] * np.pi / 180):.2f}",
+        "compute_answer": lambda params: f"B. {(_LIFT_SLOPE_PER_DEG * params['angle']):.2f}",
         "options": lambda params: [
-            f"A. {(2 * np.pi * (params['angle'] + 1) * np.pi / 180):.2f}",
-            f"B. {(2 * np.pi * params['angle'] * np.pi / 180):.2f}",
-            f"C. {(2 * np.pi * max(1, params['angle'] - 1) * np.pi / 180):.2f}",
-            f"D. {(2 * np.pi * (params['angle'] + 2) * np.pi / 180):.2f}"
+            f"A. {(_LIFT_SLOPE_PER_DEG * (params['angle'] + 1)):.2f}",
+            f"B. {(_LIFT_SLOPE_PER_DEG * params['angle']):.2f}",
+            f"C. {(_LIFT_SLOPE_PER_DEG * max(1, params['angle'] - 1)):.2f}",
+            f"D. {(_LIFT_SLOPE_PER_DEG * (params['angle'] + 2)):.2f}"
         ]
     },
     {
-        "template": Template("A simply supported beam (length {{L}} m, point load {{P}} kN at center) has maximum bending moment in kNm:"),
+        "template": lambda p: f"A simply supported beam (length {p['L']} m, point load {p['P']} kN at center) has maximum bending moment in kNm:",
         "difficulty": "beginner",
         "topic": "Structures",
         "goal": "GATE",
         "generate_params": lambda: {
-            "L": np.random.randint(1, 4),
-            "P": np.random.randint(5, 15)
+            "L": _rng.randint(1, 3),
+            "P": _rng.randint(5, 14)
         },
         "compute_answer": lambda params: f"{(params['P'] * params['L'] / 4):.2f}",
         "options": []
     },
     {
-        "template": Template("A compressor stage has a stagnation pressure ratio of {{pr}}. If inlet stagnation temperature is {{T}} K, the outlet stagnation temperature is (in K, γ = 1.4, to two decimal places):"),
+        "template": lambda p: f"A compressor stage has a stagnation pressure ratio of {p['pr']}. If inlet stagnation temperature is {p['T']} K, the outlet stagnation temperature is (in K, γ = 1.4, to two decimal places):",
         "difficulty": "intermediate",
         "topic": "Propulsion",
         "goal": "GATE",
         "generate_params": lambda: {
-            "pr": round(np.random.uniform(1.1, 1.3), 1),
-            "T": np.random.randint(280, 320)
+            "pr": round(_rng.uniform(1.1, 1.3), 1),
+            "T": _rng.randint(280, 319)
         },
         "compute_answer": lambda params: f"{(params['T'] * (params['pr'] ** ((1.4 - 1) / 1.4))):.2f}",
         "options": []
     },
     {
-        "template": Template("For an aircraft in a steady, level, coordinated turn at a turn radius of {{R}} m and velocity {{V}} m/s, the load factor is (to two decimal places):"),
+        "template": lambda p: f"For an aircraft in a steady, level, coordinated turn at a turn radius of {p['R']} m and velocity {p['V']} m/s, the load factor is (to two decimal places):",
         "difficulty": "advanced",
         "topic": "Flight Mechanics",
         "goal": "GATE",
         "generate_params": lambda: {
-            "R": np.random.randint(500, 1500),
-            "V": np.random.randint(50, 100)
+            "R": _rng.randint(500, 1499),
+            "V": _rng.randint(50, 99)
         },
-        "compute_answer": lambda params: f"B. {(np.sqrt(1 + (params['V']**2 / (9.81 * params['R']))**2)):.2f}",
-        "options": lambda params: [
-            f"A. {(np.sqrt(1 + (params['V']**2 / (9.81 * params['R']))**2) - 0.2):.2f}",
-            f"B. {(np.sqrt(1 + (params['V']**2 / (9.81 * params['R']))**2)):.2f}",
-            f"C. {(np.sqrt(1 + (params['V']**2 / (9.81 * params['R']))**2) + 0.2):.2f}",
-            f"D. {(np.sqrt(1 + (params['V']**2 / (9.81 * params['R']))**2) + 0.4):.2f}"
-        ]
+        "evaluate": lambda params: _mcq(_load_factor(params), ".2f")
     },
     {
-        "template": Template("The sum of the eigenvalues of the matrix [[{{a}}, 0], [0, {{b}}]] is (to one decimal place):"),
+        "template": lambda p: f"The sum of the eigenvalues of the matrix [[{p['a']}, 0], [0, {p['b']}]] is (to one decimal place):",
         "difficulty": "advanced",
         "topic": "Engineering Mathematics",
         "goal": "GATE",
         "generate_params": lambda: {
-            "a": np.random.randint(1, 5),
-            "b": np.random.randint(1, 5)
+            "a": _rng.randint(1, 4),
+            "b": _rng.randint(1, 4)
         },
         "compute_answer": lambda params: f"{(params['a'] + params['b']):.1f}",
         "options": []
     },
     # GATE New Templates
     {
-        "template": Template("A solid circular shaft of diameter {{d}} mm is subjected to a torque of {{T}} Nm. The maximum shear stress is (in MPa, to two decimal places):"),
+        "template": lambda p: f"A solid circular shaft of diameter {p['d']} mm is subjected to a torque of {p['T']} Nm. The maximum shear stress is (in MPa, to two decimal places):",
         "difficulty": "intermediate",
         "topic": "Mechanics",
         "goal": "GATE",
         "generate_params": lambda: {
-            "d": np.random.randint(20, 50),
-            "T": np.random.randint(100, 500)
+            "d": _rng.randint(20, 49),
+            "T": _rng.randint(100, 499)
         },
-        "compute_answer": lambda params: f"{((16 * params['T'] * 1000) / (np.pi * (params['d'] / 1000)**3) / 1e6):.2f}",
+        "compute_answer": lambda params: f"{((16 * params['T'] * 1000) / (math.pi * (params['d'] / 1000)**3) / 1e6):.2f}",
         "options": []
     },
     {
-        "template": Template("The orbital velocity of a satellite in a circular orbit at {{h}} km altitude is (in km/s, to two decimal places, R = 6371 km, μ = 398600 km³/s²):"),
+        "template": lambda p: f"The orbital velocity of a satellite in a circular orbit at {p['h']} km altitude is (in km/s, to two decimal places, R = 6371 km, μ = 398600 km³/s²):",
         "difficulty": "intermediate",
         "topic": "Space Dynamics",
         "goal": "GATE",
         "generate_params": lambda: {
-            "h": np.random.randint(300, 600)
+            "h": _rng.randint(300, 599)
         },
-        "compute_answer": lambda params: f"B. {(np.sqrt(398600 / (6371 + params['h']))):.2f}",
-        "options": lambda params: [
-            f"A. {(np.sqrt(398600 / (6371 + params['h'])) - 0.2):.2f}",
-            f"B. {(np.sqrt(398600 / (6371 + params['h']))):.2f}",
-            f"C. {(np.sqrt(398600 / (6371 + params['h'])) + 0.2):.2f}",
-            f"D. {(np.sqrt(398600 / (6371 + params['h'])) + 0.4):.2f}"
-        ]
+        "evaluate": lambda params: _mcq(_orbital_velocity(params), ".2f")
     },
     {
-        "template": Template("The determinant of the matrix [[{{a}}, {{b}}], [{{c}}, {{d}}]] is:"),
+        "template": lambda p: f"The determinant of the matrix [[{p['a']}, {p['b']}], [{p['c']}, {p['d']}]] is:",
         "difficulty": "advanced",
         "topic": "Linear Algebra",
         "goal": "GATE",
         "generate_params": lambda: {
-            "a": np.random.randint(1, 5),
-            "b": np.random.randint(1, 5),
-            "c": np.random.randint(1, 5),
-            "d": np.random.randint(1, 5)
+            "a": _rng.randint(1, 4),
+            "b": _rng.randint(1, 4),
+            "c": _rng.randint(1, 4),
+            "d": _rng.randint(1, 4)
         },
         "compute_answer": lambda params: f"{(params['a'] * params['d'] - params['b'] * params['c']):.0f}",
         "options": []
     },
     {
-        "template": Template("For an ideal gas with specific heat at constant pressure {{cp}} J/kg·K and specific heat ratio {{gamma}}, the specific heat at constant volume is (in J/kg·K, to one decimal place):"),
+        "template": lambda p: f"For an ideal gas with specific heat at constant pressure {p['cp']} J/kg·K and specific heat ratio {p['gamma']}, the specific heat at constant volume is (in J/kg·K, to one decimal place):",
         "difficulty": "beginner", 
         "topic": "Thermodynamics",
         "goal": "GATE",
         "generate_params": lambda: {
-            "cp": np.random.randint(1000, 1200),
-            "gamma": round(np.random.uniform(1.3, 1.5), 2)
+            "cp": _rng.randint(1000, 1199),
+            "gamma": round(_rng.uniform(1.3, 1.5), 2)
         },
-        "compute_answer": lambda params: f"B. {(params['cp'] / params['gamma']):.1f}",
-        "options": lambda params: [
-            f"A. {(params['cp'] / params['gamma'] - 50):.1f}",
-            f"B. {(params['cp'] / params['gamma']):.1f}",
-            f"C. {(params['cp'] / params['gamma'] + 50):.1f}",
-            f"D. {(params['cp'] / params['gamma'] + 100):.1f}"
-        ]
+        "evaluate": lambda params: _mcq(params['cp'] / params['gamma'], ".1f", deltas=(-50, 0, 50, 100))
     },
     # Amazon SDE Templates (Existing)
     {
-        "template": Template("What is the time complexity of {{operation}} in a balanced binary search tree?"),
+        "template": lambda p: f"What is the time complexity of {p['operation']} in a balanced binary search tree?",
         "difficulty": "intermediate",
         "topic": "Data Structures",
         "goal": "Amazon SDE",
         "generate_params": lambda: {
-            "operation": random.choice(["searching", "insertion", "deletion"])
+            "operation": _rng.choice(["searching", "insertion", "deletion"])
         },
         "compute_answer": lambda params: "B. O(log n)",
         "options": [
@@ -184,12 +201,12 @@ TEMPLATES = [
         ]
     },
     {
-        "template": Template("What is the space complexity of an adjacency {{structure}} representation of a graph with V vertices and E edges?"),
+        "template": lambda p: f"What is the space complexity of an adjacency {p['structure']} representation of a graph with V vertices and E edges?",
         "difficulty": "advanced",
         "topic": "Data Structures",
         "goal": "Amazon SDE",
         "generate_params": lambda: {
-            "structure": random.choice(["list", "matrix"])
+            "structure": _rng.choice(["list", "matrix"])
         },
         "compute_answer": lambda params: "B. O(V + E)" if params["structure"] == "list" else "C. O(V²)",
         "options": [
@@ -200,23 +217,23 @@ TEMPLATES = [
         ]
     },
     {
-        "template": Template("What is the maximum number of nodes in a binary tree of height {{h}}?"),
+        "template": lambda p: f"What is the maximum number of nodes in a binary tree of height {p['h']}?",
         "difficulty": "intermediate",
         "topic": "Data Structures",
         "goal": "Amazon SDE",
         "generate_params": lambda: {
-            "h": np.random.randint(2, 6)
+            "h": _rng.randint(2, 5)
         },
         "compute_answer": lambda params: f"{(2**params['h'] - 1):.0f}",
         "options": []
     },
     {
-        "template": Template("Which AWS service provides a {{service_type}}?"),
+        "template": lambda p: f"Which AWS service provides a {p['service_type']}?",
         "difficulty": "beginner",
         "topic": "AWS",
         "goal": "Amazon SDE",
         "generate_params": lambda: {
-            "service_type": random.choice(["NoSQL database", "managed message queuing service"])
+            "service_type": _rng.choice(["NoSQL database", "managed message queuing service"])
         },
         "compute_answer": lambda params: "B. DynamoDB" if params["service_type"] == "NoSQL database" else "A. SQS",
         "options": lambda params: [
@@ -233,12 +250,12 @@ TEMPLATES = [
     },
     # Amazon SDE New Templates
     {
-        "template": Template("What is the time complexity of {{algorithm}} sort in the average case?"),
+        "template": lambda p: f"What is the time complexity of {p['algorithm']} sort in the average case?",
         "difficulty": "intermediate",
         "topic": "Algorithms",
         "goal": "Amazon SDE",
         "generate_params": lambda: {
-            "algorithm": random.choice(["Merge", "Quick"])
+            "algorithm": _rng.choice(["Merge", "Quick"])
         },
         "compute_answer": lambda params: "B. O(n log n)",
         "options": [
@@ -249,19 +266,19 @@ TEMPLATES = [
         ]
     },
     {
-        "template": Template("A SQL query selects rows from a table with {{n}} rows where a column value is greater than {{val}}. How many rows are returned?"),
+        "template": lambda p: f"A SQL query selects rows from a table with {p['n']} rows where a column value is greater than {p['val']}. How many rows are returned?",
         "difficulty": "beginner",
         "topic": "Databases",
         "goal": "Amazon SDE",
         "generate_params": lambda: {
-            "n": np.random.randint(10, 50),
-            "val": np.random.randint(1, 5)
+            "n": _rng.randint(10, 49),
+            "val": _rng.randint(1, 4)
         },
         "compute_answer": lambda params: f"{max(0, params['n'] - params['val']):.0f}",
         "options": []
     },
     {
-        "template": Template("What does the CAP theorem stand for in distributed systems?"),
+        "template": lambda p: "What does the CAP theorem stand for in distributed systems?",
         "difficulty": "advanced",
         "topic": "System Design",
         "goal": "Amazon SDE",
@@ -275,112 +292,94 @@ TEMPLATES = [
         ]
     },
     {
-        "template": Template("The HTTP status code {{code}} indicates:"),
+        "template": lambda p: f"The HTTP status code {p['code']} indicates:",
         "difficulty": "intermediate",
         "topic": "Web Development",
         "goal": "Amazon SDE",
         "generate_params": lambda: {
-            "code": random.choice([200, 404, 500])
+            "code": _rng.choice([200, 404, 500])
         },
         "compute_answer": lambda params: "OK" if params["code"] == 200 else "Not Found" if params["code"] == 404 else "Internal Server Error",
         "options": []
     },
     # CAT Templates (Existing)
     {
-        "template": Template("What is the simple interest on ${{P}} at {{r}}% per annum for {{t}} years?"),
+        "template": lambda p: f"What is the simple interest on ${p['P']} at {p['r']}% per annum for {p['t']} years?",
         "difficulty": "beginner",
         "topic": "Quantitative Ability - Interest",
         "goal": "CAT",
         "generate_params": lambda: {
-            "P": np.random.randint(500, 2000),
-            "r": np.random.randint(2, 10),
-            "t": np.random.randint(1, 5)
+            "P": _rng.randint(500, 1999),
+            "r": _rng.randint(2, 9),
+            "t": _rng.randint(1, 4)
         },
         "compute_answer": lambda params: f"${(params['P'] * params['r'] * params['t'] / 100):.2f}",
         "options": []
     },
     {
-        "template": Template("Solve for x: {{a}}x + {{b}} = {{c}}."),
+        "template": lambda p: f"Solve for x: {p['a']}x + {p['b']} = {p['c']}.",
         "difficulty": "intermediate",
         "topic": "Quantitative Ability - Algebra",
         "goal": "CAT",
         "generate_params": lambda: {
-            "a": np.random.randint(2, 6),
-            "b": np.random.randint(1, 10),
-            "c": np.random.randint(10, 20)
+            "a": _rng.randint(2, 5),
+            "b": _rng.randint(1, 9),
+            "c": _rng.randint(10, 19)
         },
-        "compute_answer": lambda params: f"B. {(params['c'] - params['b']) / params['a']:.0f}",
-        "options": lambda params: [
-            f"A. {((params['c'] - params['b']) / params['a'] - 1):.0f}",
-            f"B. {((params['c'] - params['b']) / params['a']):.0f}",
-            f"C. {((params['c'] - params['b']) / params['a'] + 1):.0f}",
-            f"D. {((params['c'] - params['b']) / params['a'] + 2):.0f}"
-        ]
+        "evaluate": lambda params: _mcq((params['c'] - params['b']) / params['a'], ".0f", deltas=(-1, 0, 1, 2))
     },
     {
-        "template": Template("Find the area of a triangle with base {{b}} cm and height {{h}} cm."),
+        "template": lambda p: f"Find the area of a triangle with base {p['b']} cm and height {p['h']} cm.",
         "difficulty": "intermediate",
         "topic": "Quantitative Ability - Geometry",
         "goal": "CAT",
         "generate_params": lambda: {
-            "b": np.random.randint(4, 10),
-            "h": np.random.randint(5, 12)
+            "b": _rng.randint(4, 9),
+            "h": _rng.randint(5, 11)
         },
-        "compute_answer": lambda params: f"{(0.5 * params['b'] * params['h']):.2f}",
+        "compute_answer": lambda params: _TRIANGLE_AREAS[(params['b'], params['h'])],
         "options": []
     },
     {
-        "template": Template("The total sales for company X in year {{year}} is (in thousands):"),
+        "template": lambda p: f"The total sales for company X in year {p['year']} is (in thousands):",
         "difficulty": "beginner",
         "topic": "Data Interpretation and Logical Reasoning - Data Interpretation",
         "goal": "CAT",
         "generate_params": lambda: {
-            "year": np.random.randint(1, 5),
-            "sales": np.random.randint(100, 400)
+            "year": _rng.randint(1, 4),
+            "sales": _rng.randint(100, 399)
         },
-        "compute_answer": lambda params: f"B. {params['sales']}",
-        "options": lambda params: [
-            f"A. {params['sales'] - 50}",
-            f"B. {params['sales']}",
-            f"C. {params['sales'] + 50}",
-            f"D. {params['sales'] + 100}"
-        ]
+        "evaluate": lambda params: _mcq(params['sales'], "", deltas=(-50, 0, 50, 100))
     },
     # CAT New Templates
     {
-        "template": Template("The smallest number that leaves remainders {{r1}}, {{r2}} when divided by {{d1}}, {{d2}} respectively is:"),
+        "template": lambda p: f"The smallest number that leaves remainders {p['r1']}, {p['r2']} when divided by {p['d1']}, {p['d2']} respectively is:",
         "difficulty": "intermediate",
         "topic": "Quantitative Ability - HCF and LCM",
         "goal": "CAT",
         "generate_params": lambda: {
-            "r1": np.random.randint(1, 5),
-            "r2": np.random.randint(1, 5),
-            "d1": np.random.randint(5, 10),
-            "d2": np.random.randint(5, 10)
+            "r1": _rng.randint(1, 4),
+            "r2": _rng.randint(1, 4),
+            "d1": _rng.randint(5, 9),
+            "d2": _rng.randint(5, 9)
         },
-        "compute_answer": lambda params: f"B. {params['r1'] + params['d1'] * (params['r2'] - params['r1']) // np.gcd(params['d1'], params['d2'])}",
-        "options": lambda params: [
-            f"A. {params['r1'] + params['d1'] * (params['r2'] - params['r1']) // np.gcd(params['d1'], params['d2']) - 10}",
-            f"B. {params['r1'] + params['d1'] * (params['r2'] - params['r1']) // np.gcd(params['d1'], params['d2'])}",
-            f"C. {params['r1'] + params['d1'] * (params['r2'] - params['r1']) // np.gcd(params['d1'], params['d2']) + 10}",
-            f"D. {params['r1'] + params['d1'] * (params['r2'] - params['r1']) // np.gcd(params['d1'], params['d2']) + 20}"
-        ]
+        "evaluate": lambda params: _mcq(_smallest_with_remainders(params), "", deltas=(-10, 0, 10, 20))
     },
     {
-        "template": Template("The sum of the roots of the quadratic equation {{a}}x² + {{b}}x + {{c}} = 0 is:"),
+        "template": lambda p: f"The sum of the roots of the quadratic equation {p['a']}x² + {p['b']}x + {p['c']} = 0 is:",
         "difficulty": "advanced",
         "topic": "Quantitative Ability - Quadratic Equations",
         "goal": "CAT",
         "generate_params": lambda: {
-            "a": np.random.randint(1, 5),
-            "b": np.random.randint(-10, 10),
-            "c": np.random.randint(-10, 10)
+            "a": _rng.randint(1, 4),
+            "b": _rng.randint(-10, 9),
+            "c": _rng.randint(-10, 9)
         },
-        "compute_answer": lambda params: f"{(-params['b'] / params['a']):.2f}",
+        "compute_answer": lambda params: _SUMROOTS[(params['a'], params['b'])],
         "options": []
     },
     {
-        "template": Template("In a seating arrangement, if A sits to the left of B and B sits to the right of C, who is in the middle?"),
+        "template": lambda p: "In a seating arrangement, if A sits to the left of B and B sits to the right of C, who is in the middle?",
         "difficulty": "beginner",
         "topic": "Data Interpretation and Logical Reasoning - Logical Reasoning",
         "goal": "CAT",
@@ -394,14 +393,28 @@ TEMPLATES = [
         ]
     },
     {
-        "template": Template("The probability of getting a {{event}} when rolling a fair six-sided die is (to two decimal places):"),
+        "template": lambda p: f"The probability of getting a {p['event']} when rolling a fair six-sided die is (to two decimal places):",
         "difficulty": "intermediate",
         "topic": "Quantitative Ability - Probability",
         "goal": "CAT",
         "generate_params": lambda: {
-            "event": random.choice(["prime number", "even number"])
+            "event": _rng.choice(["prime number", "even number"])
         },
         "compute_answer": lambda params: "0.50" if params["event"] == "even number" else "0.50",
         "options": []
     }
 ]
+
+# Parallel (structure-of-arrays) views of the template keys, and the template
+# positions for each (goal, difficulty), built once at import
+_GOALS = tuple(t["goal"] for t in TEMPLATES)
+_DIFFICULTIES = tuple(t["difficulty"] for t in TEMPLATES)
+_TEMPLATE_INDICES = {}
+for _i, _key in enumerate(zip(_GOALS, _DIFFICULTIES)):
+    _TEMPLATE_INDICES.setdefault(_key, []).append(_i)
+_TEMPLATE_INDICES = {key: tuple(indices) for key, indices in _TEMPLATE_INDICES.items()}
+del _i, _key
+
+def indices_for(goal: str, difficulty: str) -> tuple:
+    """Return the positions in TEMPLATES of templates for a goal and difficulty (empty if none)."""
+    return _TEMPLATE_INDICES.get((goal, difficulty), ())
@@ -1,49 +1,42 @@
-import random
 from typing import List
 import logging
-from app.generators.templateRetrieval.questionTemplates import TEMPLATES
-
-# Mock QuizQuestion and Generator for testing (replace with actual imports)
-class QuizQuestion:
-    def __init__(self, type, question, options, answer, difficulty, topic, goal):
-        self.type = type
-        self.question = question
-        self.options = options
-        self.answer = answer
-        self.difficulty = difficulty
-        self.topic = topic 
-        self.goal = goal
-
-class Generator:
-    def generate(self, goal: str, difficulty: str, num_questions: int, **kwargs) -> List[QuizQuestion]:
-        pass
+import numpy as np
+from app.questions import QuizQuestion
+from app.generators.base import Generator
+from app.generators.templateRetrieval.questionTemplates import TEMPLATES, indices_for
 
 logger = logging.getLogger(__name__)
 
 class QuestionTemplateGenerator(Generator):
     def __init__(self):
         self.templates = TEMPLATES
+        self.rng = np.random.default_rng()
 
     def generate(self, goal: str, difficulty: str, num_questions: int, **kwargs) -> List[QuizQuestion]:
         try:
-            valid_templates = [t for t in self.templates if t["difficulty"] == difficulty and t["goal"] == goal]
-            if not valid_templates:
+            indices = indices_for(goal, difficulty)
+            if not indices:
                 raise ValueError(f"No templates available for goal='{goal}', difficulty='{difficulty}'")
             
             questions = []
-            for _ in range(num_questions):
-                template = random.choice(valid_templates)
+            # Draw every template choice in one call
+            for index in self.rng.choice(indices, size=num_questions):
+                template = self.templates[index]
                 params = template["generate_params"]()
-                question_text = template["template"].render(**params)
-                answer = template["compute_answer"](params)
-                options = template.get("options", [])
-                if callable(options):
-                    options = options(params)
+                question_text = template["template"](params)
+                if "evaluate" in template:
+                    # Answer and options derived from one shared computation
+                    answer, options = template["evaluate"](params)
+                else:
+                    answer = template["compute_answer"](params)
+                    options = template.get("options", [])
+                    if callable(options):
+                        options = options(params)
                 
                 questions.append(QuizQuestion(
                     type="mcq" if options else "short_answer",
                     question=question_text,
-                    options=options,
+                    options=options or None,
                     answer=answer,
                     difficulty=difficulty,
                     topic=template["topic"],
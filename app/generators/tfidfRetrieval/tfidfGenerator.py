@@ -2,83 +2,80 @@ from typing import List
 from app.questions import QuizQuestion
 from app.generators.base import Generator
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-import random
-from cachetools import cached, TTLCache
 from app.utils.config_loader import CONFIG
 import logging
+import random
+import string
 
 logger = logging.getLogger(__name__)
 
-tfidf_cache = TTLCache(maxsize=CONFIG['CACHE_MAXSIZE'], ttl=CONFIG['CACHE_TTL'])
+_PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
 
 def preprocess_text(text: str) -> str:
-    import string
-    text = text.lower() 
-    text = text.translate(str.maketrans('', '', string.punctuation))
-    return text
+    return text.lower().translate(_PUNCTUATION_TABLE)
 
-@cached(tfidf_cache)
-def get_tfidf_matrix(questions: List[QuizQuestion], cache_key: str) -> tuple:
-    documents = [preprocess_text(f"{q.question} {q.goal} {q.topic}") for q in questions]
-    vectorizer = TfidfVectorizer(stop_words='english')
-    tfidf_matrix = vectorizer.fit_transform(documents)
-    return vectorizer, tfidf_matrix
+def _without_options(q: QuizQuestion) -> QuizQuestion:
+    """Ensure options is None for short_answer questions; the bank already normalizes this
+    on load, so existing objects are kept as-is."""
+    return q if q.type != 'short_answer' or q.options is None else q.model_copy(update={'options': None})
 
 class TfidfGenerator(Generator):
     def __init__(self, questions: List[QuizQuestion]):
         self.questions = questions
+        # Fit once over the whole bank. preprocess_text runs inside the vectorizer for
+        # documents and queries alike; norm='l2' keeps rows unit length, so cosine
+        # similarity is a plain dot product. float32 halves the bytes each mat-vec moves
+        self.vectorizer = TfidfVectorizer(stop_words='english', preprocessor=preprocess_text, norm='l2', dtype=np.float32)
+        buckets = {}
+        for i, q in enumerate(questions):
+            buckets.setdefault((q.goal, q.difficulty), []).append(i)
+        self.buckets = {key: np.array(rows) for key, rows in buckets.items()}
+        self.bucket_ranked = {}
+        if questions:
+            try:
+                self._rank_buckets(questions)
+            except Exception as e:
+                # e.g. a bank of only stop words leaves an empty vocabulary
+                logger.error(f"TF-IDF ranking failed: {str(e)}. Falling back to random sampling.")
+                self.bucket_ranked = {}
+
+    def _rank_buckets(self, questions: List[QuizQuestion]):
+        """Fit the vectorizer over the bank and store each bucket's questions in ranked order."""
+        tfidf_matrix = self.vectorizer.fit_transform([f"{q.question} {q.goal} {q.topic}" for q in questions])
+        # Rows must be unit length (or empty) for the dot product to equal cosine similarity
+        norms = np.sqrt(np.asarray(tfidf_matrix.multiply(tfidf_matrix).sum(axis=1)).ravel())
+        if not np.all((np.abs(norms - 1) < 1e-4) | (norms == 0)):
+            raise ValueError("TF-IDF rows are not L2-normalized")
+        # The query for a (goal, difficulty) bucket is always its goal, so each bucket's
+        # ranking is fixed for a given bank: score it once here and serve the top
+        # num_questions as a slice per request
+        for key, rows in self.buckets.items():
+            query_vector = self.vectorizer.transform([key[0]])
+            similarities = (tfidf_matrix[rows] @ query_vector.T).toarray().ravel()
+            # Descending, ties broken by the highest row first, as argsort(...)[::-1] always did
+            order = np.argsort(similarities, kind='stable')[::-1]
+            self.bucket_ranked[key] = [_without_options(questions[i]) for i in rows[order]]
 
     def generate(self, goal: str, difficulty: str, num_questions: int, **kwargs) -> List[QuizQuestion]:
-        matching_questions = [q for q in self.questions if q.goal == goal and q.difficulty == difficulty]
-        
-        if not matching_questions:
+        rows = self.buckets.get((goal, difficulty))
+
+        if rows is None:
             raise ValueError(f"No questions available for goal '{goal}' and difficulty '{difficulty}'")
-        
+
         if num_questions > CONFIG['max_questions']:
             num_questions = CONFIG['max_questions']
         if num_questions < CONFIG['default_num_questions']:
             num_questions = CONFIG['default_num_questions']
-        
-        if len(matching_questions) < num_questions:
+
+        if len(rows) < num_questions:
             raise ValueError(
-                f"Requested {num_questions} questions, but only {len(matching_questions)} "
+                f"Requested {num_questions} questions, but only {len(rows)} "
                 f"available for goal '{goal}' and difficulty '{difficulty}'"
             )
-        
-        documents = [preprocess_text(f"{q.question} {q.goal} {q.topic}") for q in matching_questions]
-        query = preprocess_text(goal)
-        
-        try:
-            cache_key = f"{goal}_{difficulty}"
-            vectorizer, tfidf_matrix = get_tfidf_matrix(matching_questions, cache_key)
-            query_vector = vectorizer.transform([query])
-            similarities = cosine_similarity(query_vector, tfidf_matrix).flatten()
-            top_indices = np.argsort(similarities)[::-1][:num_questions]
-            
-            if len(top_indices) < num_questions:
-                logger.warning(
-                    f"Only {len(top_indices)} relevant questions found for goal '{goal}', "
-                    f"difficulty '{difficulty}'. Falling back to random sampling."
-                )
-                return random.sample(matching_questions, num_questions)
-            
-            # Ensure options is None for short_answer questions
-            selected_questions = []
-            for i in top_indices:
-                q = matching_questions[i]
-                selected_questions.append(QuizQuestion(
-                    type=q.type,
-                    question=q.question,
-                    options=None if q.type == 'short_answer' else q.options,
-                    answer=q.answer,
-                    difficulty=q.difficulty,
-                    topic=q.topic,
-                    goal=q.goal
-                ))
-            return selected_questions
-        
-        except Exception as e:
-            logger.error(f"TF-IDF retrieval failed: {str(e)}. Falling back to random sampling.")
-            return random.sample(matching_questions, num_questions)
\ No newline at end of file
+
+        ranked = self.bucket_ranked.get((goal, difficulty))
+        if ranked is None:
+            # Ranking failed at fit time: serve an unranked sample of the bucket
+            return [_without_options(self.questions[i]) for i in random.sample(rows.tolist(), num_questions)]
+        return ranked[:num_questions]
@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 import uvicorn
 from app.api.routes import router
 from app.api.middleware import track_metrics, lifespan
@@ -8,13 +9,11 @@ app = FastAPI(
     title="Questions API",
     description="API for retrieving GATE , CAT and Amazon SDE questions",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+    exception_handlers=exception_handlers  # Global exception handlers
 )
 
-# Register global exception handlers
-for exc_type, handler in exception_handlers.items():
-    app.add_exception_handler(exc_type, handler)
-
 # Add middleware
 app.middleware("http")(track_metrics)
 
@@ -22,4 +21,6 @@ app.middleware("http")(track_metrics)
 app.include_router(router)
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="127.0.0.1", port=8000, workers=4) 
\ No newline at end of file
+    # Import string so each worker imports the app itself; "auto" picks uvloop/httptools when installed
+    uvicorn.run("app.main:app", host="127.0.0.1", port=8000, workers=4,
+                loop="auto", http="auto", access_log=False, log_level="warning") 
\ No newline at end of file
@@ -1,18 +1,18 @@
-import json
+import mmap
 import os
-import logging
+import sys
 import structlog
-from typing import List, Dict, Optional
-from pydantic import BaseModel
+from typing import List, Dict, NamedTuple, Optional
+from collections import Counter
+from operator import attrgetter
+from pydantic import BaseModel, ConfigDict
 import orjson
 from pathlib import Path
-from cachetools import cached, TTLCache
-from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from app.utils.config_loader import CONFIG
 from filelock import FileLock
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging handlers are configured once in app.utils.config_loader
 logger = structlog.get_logger(__name__)
 
 class QuizQuestion(BaseModel):
@@ -24,20 +24,34 @@ class QuizQuestion(BaseModel):
     topic: str
     goal: str
 
-    class Config:
-        json_loads = orjson.loads
-        json_dumps = lambda x, **kwargs: orjson.dumps(x).decode()
+    # Loaded questions are shared by every request and indexed by identity, so never mutate them.
+    model_config = ConfigDict(frozen=True)
 
 supported_difficulties = CONFIG.get('supported_difficulties', [])
+# Membership checks in the per-item validator use the set; messages keep the configured order
+_supported_difficulties_set = frozenset(supported_difficulties)
 logger.info(f"Supported difficulties: {supported_difficulties}")
-# Thread-safe cache
-question_cache = TTLCache(maxsize=CONFIG['CACHE_MAXSIZE'], ttl=CONFIG['CACHE_TTL'])
+_QUESTION_TYPES = frozenset(('mcq', 'short_answer'))
+_INTERNED_FIELDS = ('type', 'goal', 'difficulty', 'topic')
 
-# Thread pool
-executor = ThreadPoolExecutor(max_workers=CONFIG['MAX_WORKERS'])
+# Counts over the most recently loaded bank, rebuilt by load_questions on every (re)load
+_BY_GOAL: Counter = Counter()
+_BY_TYPE: Counter = Counter()
+_BY_GOAL_TYPE: Counter = Counter()
 
-def _validate_question_item(item: Dict) -> Dict:
-    """Basic validation for question data with logging for problematic entries."""
+def _index_questions(questions: List[QuizQuestion]):
+    """Count questions by goal, type and (goal, type)."""
+    global _BY_GOAL, _BY_TYPE, _BY_GOAL_TYPE
+    # map(attrgetter) keeps the counting loops in C
+    _BY_GOAL = Counter(map(attrgetter('goal'), questions))
+    _BY_TYPE = Counter(map(attrgetter('type'), questions))
+    _BY_GOAL_TYPE = Counter(map(attrgetter('goal', 'type'), questions))
+
+def _validate_question_item(item: Dict, supported_goals: Optional[List[str]] = None) -> Dict:
+    """Basic validation for question data with logging for problematic entries.
+
+    The goal is checked against supported_goals, defaulting to the configured ones.
+    """
     item = item.copy()
     item.setdefault('options', None)
     item.setdefault('difficulty', 'intermediate')
@@ -45,97 +59,46 @@ def _validate_question_item(item: Dict) -> Dict:
     item.setdefault('goal', '')
     item.setdefault('answer', '')
     
+    # Read the fields used by several checks once ('options' always exists after setdefault)
+    q_type = item.get('type')
+    options = item['options']
     try:
         # Validate question type
-        if item.get('type') not in ('mcq', 'short_answer'):
-            logger.error(
-                "Invalid question type",
-                question=item.get('question', 'unknown'),
-                type=item.get('type'),
-                error="type must be 'mcq' or 'short_answer'"
-            )
+        if q_type not in _QUESTION_TYPES:
             raise ValueError("type must be 'mcq' or 'short_answer'")
         
         # Validation for mcq questions
-        if item.get('type') == 'mcq':
-            if not item.get('options') or not isinstance(item['options'], list) or len(item['options']) != 4:
-                logger.error(
-                    "Invalid mcq options",
+        if q_type == 'mcq':
+            if not options or not isinstance(options, list) or len(options) != 4:
+                raise ValueError("mcq questions must have exactly 4 options")
+            if not all(isinstance(option, str) for option in options):
+                raise ValueError("mcq options must be strings")
+        # Validation for short_answer questions (legacy empty lists become null)
+        elif options is not None:
+            if isinstance(options, list) and len(options) == 0:
+                logger.warning(
+                    "Legacy short_answer options detected, converting to null",
                     question=item.get('question', 'unknown'),
-                    options=item.get('options'),
-                    error="mcq questions must have exactly 4 options"
+                    options=options
                 )
-                raise ValueError("mcq questions must have exactly 4 options")
-        
-        # Validation for short_answer questions
-        if item.get('type') == 'short_answer':
-            if item.get('options') is not None:
-                if isinstance(item['options'], list) and len(item['options']) == 0:
-                    logger.warning(
-                        "Legacy short_answer options detected, converting to null",
-                        question=item.get('question', 'unknown'),
-                        options=item.get('options')
-                    )
-                    item['options'] = None
-                else:
-                    logger.error(
-                        "Invalid short_answer options",
-                        question=item.get('question', 'unknown'),
-                        options=item.get('options'),
-                        error="short_answer questions must have options set to null or an empty list"
-                    )
-                    raise ValueError("short_answer questions must have options set to null or an empty list")
+                item['options'] = None
+            else:
+                raise ValueError("short_answer questions must have options set to null or an empty list")
         
         # Basic string checks
         if not isinstance(item.get('question'), str) or len(item['question']) < 10:
-            logger.error(
-                "Invalid question length",
-                question=item.get('question', 'unknown'),
-                error="question must be a string with at least 10 characters"
-            )
             raise ValueError("question must be a string with at least 10 characters")
         if not isinstance(item.get('goal'), str) or not item['goal']:
-            logger.error(
-                "Invalid goal",
-                question=item.get('question', 'unknown'),
-                goal=item.get('goal'),
-                error="goal must be a non-empty string"
-            )
             raise ValueError("goal must be a non-empty string")
-        supported_goals = CONFIG.get('supported_goals', [])
+        if supported_goals is None:
+            supported_goals = CONFIG.get('supported_goals', [])
         if item['goal'] not in supported_goals:
-            logger.error(
-                "Invalid goal",
-                question=item.get('question', 'unknown'),
-                goal=item.get('goal'),
-                supported_goals=supported_goals,
-                error=f"goal must be one of {supported_goals}"
-            )
             raise ValueError(f"goal must be one of {supported_goals}")
-        if not isinstance(item.get('difficulty'), str) or item['difficulty'] not in supported_difficulties:
-            logger.error(
-                "Invalid difficulty",
-                question=item.get('question', 'unknown'),
-                difficulty=item.get('difficulty'),
-                supported_difficulties=supported_difficulties,
-                error=f"difficulty must be one of {supported_difficulties}"
-            )
+        if not isinstance(item.get('difficulty'), str) or item['difficulty'] not in _supported_difficulties_set:
             raise ValueError(f"difficulty must be one of {supported_difficulties}")
         if not isinstance(item.get('topic'), str) or len(item['topic']) < 3:
-            logger.error(
-                "Invalid topic",
-                question=item.get('question', 'unknown'),
-                topic=item.get('topic'),
-                error="topic must be a string with at least 3 characters"
-            )
             raise ValueError("topic must be a string with at least 3 characters")
         if not isinstance(item.get('answer'), str) or len(item['answer']) == 0:
-            logger.error(
-                "Invalid answer",
-                question=item.get('question', 'unknown'),
-                answer=item.get('answer'),
-                error="answer must be a non-empty string"
-            )
             raise ValueError("answer must be a non-empty string")
     
         return item
@@ -148,29 +111,84 @@ def _validate_question_item(item: Dict) -> Dict:
         )
         raise
 
+def _bank_lock(file_path: Path) -> FileLock:
+    """The lock serializing writers of the bank file with readers of its mapping."""
+    return FileLock(str(file_path) + ".lock")
+
+def _read_bank(file_path: Path) -> List[Dict]:
+    """Parse the question bank straight from a read-only mapping, without an intermediate bytes copy.
+
+    Held under the bank lock, so an append can't change the file while it is mapped.
+    """
+    with _bank_lock(file_path):
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+def _bank_stamp(file_path: Path) -> tuple:
+    """(mtime_ns, size) of the bank file, so a rewrite within the mtime granularity is still seen."""
+    st = file_path.stat()
+    return st.st_mtime_ns, st.st_size
+
+class _GoalIndex(NamedTuple):
+    goals: frozenset
+    goal_counts: Counter
+
+@lru_cache(maxsize=1)
+def _load_goal_index(file_path: Path, stamp: tuple) -> _GoalIndex:
+    """Goal set and per-goal counts of the bank file; pass its stamp so edits invalidate it.
+
+    Only the counts are kept: the parsed items are dropped once they are counted.
+    """
+    goals = [goal for goal in (item.get('goal') for item in _read_bank(file_path)) if isinstance(goal, str)]
+    return _GoalIndex(frozenset(goal for goal in goals if goal), Counter(goals))
+
+def _goal_index() -> _GoalIndex:
+    """The memoized goal index for the configured dataset file."""
+    file_path = Path(CONFIG['DATA_DIR']) / CONFIG['DATASET']
+    return _load_goal_index(file_path, _bank_stamp(file_path))
+
+def _validate_items(questions: List[Dict]) -> List[Dict]:
+    """Run _validate_question_item over raw items and intern their low-cardinality fields."""
+    items = [_validate_question_item(item) for item in questions]
+    # These fields take a handful of distinct values: keep one shared str object per value
+    intern = sys.intern
+    for item in items:
+        for field in _INTERNED_FIELDS:
+            item[field] = intern(item[field])
+    return items
+
+# ((path, stamp, supported goals), questions) from the last full load
+_loaded_bank = (None, [])
+
+@lru_cache(maxsize=1)
 def load_questions() -> List[QuizQuestion]:
-    """Load and validate questions from file with caching and parallel processing."""
+    """Load and validate questions from file with caching.
+
+    The validated list is memoized and shared between callers, so treat it as read-only;
+    call load_questions.cache_clear() after writing to the bank. The app lifespan also
+    clears it every CACHE_TTL seconds. While the file and supported goals are unchanged,
+    a reload returns the very same list, so callers can detect changes by identity.
+    """
     try:
         file_path = Path(CONFIG['DATA_DIR']) / CONFIG['DATASET']
-        logger.info(f"Loading questions from {file_path}")
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            raw_content = f.read()
-            data = orjson.loads(raw_content)
+        # Parse and validate only when the file (or the goals it is checked against) changed
+        global _loaded_bank
+        key = (file_path, _bank_stamp(file_path), tuple(CONFIG.get('supported_goals', [])))
+        if _loaded_bank[0] == key:
+            return _loaded_bank[1]
 
+        logger.info(f"Loading questions from {file_path}")
         # Handle flat list structure
-        questions = data  # Direct list of questions
-
-        # Parallel processing for large datasets
-        if len(questions) > 100:
-            validated_questions = list(executor.map(
-                lambda item: QuizQuestion(**_validate_question_item(item)),
-                questions
-            ))
-        else:
-            # Single-threaded for small datasets
-            validated_questions = [QuizQuestion(**_validate_question_item(item)) for item in questions]
+        items = _validate_items(_read_bank(file_path))  # Direct list of questions
+
+        # _validate_question_item has checked the type of every field QuizQuestion declares
+        # (including each mcq option), so skip Pydantic's second validation pass
+        validated_questions = [QuizQuestion.model_construct(**item) for item in items]
 
+        _index_questions(validated_questions)
+        _loaded_bank = (key, validated_questions)
         logger.info(f"Loaded {len(validated_questions)} questions")
         return validated_questions
 
@@ -178,13 +196,15 @@ def load_questions() -> List[QuizQuestion]:
         logger.error(f"Error loading questions: {str(e)}")
         raise ValueError(f"Failed to load questions: {str(e)}")
 
+def get_counts() -> Dict[str, Counter]:
+    """Return question counts keyed by 'goal', 'type' and 'goal_type' ((goal, type) pairs)."""
+    load_questions()
+    return {"goal": _BY_GOAL, "type": _BY_TYPE, "goal_type": _BY_GOAL_TYPE}
+
 def get_goals_in_question_bank() -> set:
     """Return a set of unique goals present in the question bank."""
     try:
-        file_path = Path(CONFIG['DATA_DIR']) / CONFIG['DATASET']
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = orjson.loads(f.read())
-        goals = set(item.get('goal', '') for item in data if isinstance(item.get('goal', ''), str) and item.get('goal', ''))
+        goals = set(_goal_index().goals)
         logger.info(f"Goals in question bank: {goals}")
         return goals
     except Exception as e:
@@ -194,35 +214,60 @@ def get_goals_in_question_bank() -> set:
 def count_questions_for_goal(goal: str) -> int:
     """Count the number of questions for a given goal in the question bank."""
     try:
-        file_path = Path(CONFIG['DATA_DIR']) / CONFIG['DATASET']
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = orjson.loads(f.read())
-        count = sum(1 for item in data if item.get('goal') == goal)
+        count = _goal_index().goal_counts[goal]
         logger.info(f"Counted {count} questions for goal '{goal}'")
         return count
     except Exception as e:
         logger.error(f"Failed to count questions for goal '{goal}': {str(e)}")
         return 0
 
+def _array_splice_offset(f) -> Optional[tuple]:
+    """Find the closing ']' of the JSON array in f by reading only the file's tail.
+
+    Returns (offset of ']', whether the array already has items), or None when the tail
+    doesn't end in ']' (empty, truncated or otherwise unexpected file).
+    """
+    size = f.seek(0, os.SEEK_END)
+    start = max(0, size - 4096)
+    f.seek(start)
+    tail = f.read().rstrip()
+    if not tail.endswith(b"]"):
+        return None
+    return start + len(tail) - 1, not tail[:-1].rstrip().endswith(b"[")
+
 def append_questions_to_bank(questions: List[QuizQuestion]):
     """Append validated questions to the question bank."""
     try:
         file_path = Path(CONFIG['DATA_DIR']) / CONFIG['DATASET']
-        with FileLock(str(file_path) + ".lock"):
-            # Read existing questions
+        new_questions = [q.model_dump() for q in questions]
+        with _bank_lock(file_path):
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    existing_data = orjson.loads(f.read())
-            except (FileNotFoundError, orjson.JSONDecodeError):
-                existing_data = []
-            
-            # Append new questions
-            new_questions = [q.dict() for q in questions]
-            existing_data.extend(new_questions)
+                with open(file_path, 'r+b') as f:
+                    splice = _array_splice_offset(f)
+                    if splice is not None:
+                        # Splice the new objects in before the closing ']': O(new questions),
+                        # no re-parse or rewrite of the existing bank
+                        offset, has_items = splice
+                        f.seek(offset)
+                        f.write((b",\n" if has_items else b"\n")
+                                + b",\n".join(map(orjson.dumps, new_questions)) + b"\n]")
+                        f.truncate()
+            except FileNotFoundError:
+                splice = None
             
-            # Write back to file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(existing_data, f, indent=4)
+            if splice is None:
+                # Fall back to read-modify-write for missing or unexpected files
+                try:
+                    with open(file_path, 'rb') as f:
+                        existing_data = orjson.loads(f.read())
+                except (FileNotFoundError, orjson.JSONDecodeError):
+                    existing_data = []
+                existing_data.extend(new_questions)
+                # Write a sibling temp file and swap it in, so the bank is never seen half-written
+                tmp_path = file_path.with_name(file_path.name + ".tmp")
+                with open(tmp_path, 'wb') as f:
+                    f.write(orjson.dumps(existing_data, option=orjson.OPT_INDENT_2))
+                os.replace(tmp_path, file_path)
         
         logger.info(f"Appended {len(questions)} questions to question bank")
     except Exception as e:
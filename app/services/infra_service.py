@@ -1,5 +1,6 @@
 from app.api.models import HealthCheckResponse, LocalMetricsResponse, PerformanceMetricsResponse
-from app.questions import load_questions
+from app.api import middleware
+from app.questions import load_questions, get_counts
 from app.utils.config_loader import CONFIG
 import structlog
 import json
@@ -11,8 +12,39 @@ logger = structlog.get_logger(__name__)
 
 class InfraService:
     def __init__(self):
-        self.metrics_file = Path(CONFIG.get('monitoring', {}).get('metrics_file', 'metrics.json'))
-        self.performance_metrics_file = Path(CONFIG.get('monitoring', {}).get('performance_metrics_file', 'performance_metrics.json'))
+        self.performance_metrics_file = Path(CONFIG.get('monitoring', {}).get('performance_metrics_file', 'performance_metrics.jsonl'))
+        # (bank list, details) from the last health check; holding the list keeps the identity check sound
+        self._bank_details = None
+        # (bank list, serialized healthy /health body), re-encoded only when the bank changes
+        self._health_body = None
+
+    def _read_performance_metrics(self) -> List[Dict]:
+        """Parse the JSON Lines performance metrics file, skipping blank or partial lines."""
+        metrics = []
+        with open(self.performance_metrics_file, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    metrics.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    logger.warning("Skipping malformed performance metrics line")
+        return metrics
+
+    def _question_bank_details(self, questions: List) -> Dict[str, str]:
+        """Question bank summary for /health, rebuilt only when load_questions returns a new bank."""
+        cached = self._bank_details
+        if cached is not None and cached[0] is questions:
+            return cached[1]
+        # Questions by goal and by type, counted once per bank load
+        counts = get_counts()
+        details = {
+            'question_bank': f"Available ({len(questions)} questions)",
+            'questions_by_goal': ", ".join(f"{goal}: {count}" for goal, count in counts['goal'].items()),
+            'questions_by_type': ", ".join(f"{q_type}: {count}" for q_type, count in counts['type'].items())
+        }
+        self._bank_details = (questions, details)
+        return details
 
     def health_check(self) -> HealthCheckResponse:
         """Check the health of critical dependencies and provide question statistics."""
@@ -23,21 +55,7 @@ class InfraService:
             try:
                 questions = load_questions()
                 logger.info(f"Loaded {len(questions)} questions from question bank")
-                details['question_bank'] = f"Available ({len(questions)} questions)"
-                
-                # Compute questions by goal
-                goal_counts = {}
-                for q in questions:
-                    goal = q.goal
-                    goal_counts[goal] = goal_counts.get(goal, 0) + 1
-                details['questions_by_goal'] = ", ".join(f"{goal}: {count}" for goal, count in goal_counts.items())
-                
-                # Compute questions by type
-                type_counts = {}
-                for q in questions:
-                    q_type = q.type
-                    type_counts[q_type] = type_counts.get(q_type, 0) + 1
-                details['questions_by_type'] = ", ".join(f"{q_type}: {count}" for q_type, count in type_counts.items())
+                details.update(self._question_bank_details(questions))
             except Exception as e:
                 logger.error(f"Question bank check failed: {str(e)}")
                 details['question_bank'] = "Unavailable"
@@ -62,6 +80,21 @@ class InfraService:
             logger.error(f"Health check failed: {str(e)}")
             return HealthCheckResponse(status="unhealthy", details={"error": str(e)})
 
+    def health_check_body(self) -> bytes:
+        """Serialized /health body; a healthy result is cached until load_questions returns a new bank."""
+        cached = self._health_body
+        if cached is not None:
+            try:
+                if load_questions() is cached[0]:
+                    return cached[1]
+            except Exception:
+                pass
+        response = self.health_check()
+        body = orjson.dumps(response.model_dump())
+        if response.status == "healthy":
+            self._health_body = (self._bank_details[0], body)
+        return body
+
     def get_health_chart_data(self) -> Dict:
         """Generate data for Chart.js visualizations of question counts and performance metrics."""
         try:
@@ -81,26 +114,17 @@ class InfraService:
             try:
                 questions = load_questions()
                 logger.info(f"Generating chart data for {len(questions)} questions")
-                goal_counts = {}
-                goal_type_counts = {}
-                for q in questions:
-                    goal = q.goal
-                    q_type = q.type
-                    # Total count per goal
-                    goal_counts[goal] = goal_counts.get(goal, 0) + 1
-                    # Count per goal and type
-                    if goal not in goal_type_counts:
-                        goal_type_counts[goal] = {"mcq": 0, "short_answer": 0}
-                    if q_type in goal_type_counts[goal]:
-                        goal_type_counts[goal][q_type] += 1
+                counts = get_counts()
+                goal_counts = counts['goal']
+                goal_type_counts = counts['goal_type']
                 
                 chart_data["question_count_by_goal"]["labels"] = list(goal_counts.keys())
                 chart_data["question_count_by_goal"]["data"] = list(goal_counts.values())
                 chart_data["question_count_by_goal_and_type"] = {
                     goal: {
                         "labels": ["MCQ", "Short Answer"],
-                        "data": [counts["mcq"], counts["short_answer"]]
-                    } for goal, counts in goal_type_counts.items()
+                        "data": [goal_type_counts[(goal, "mcq")], goal_type_counts[(goal, "short_answer")]]
+                    } for goal in goal_counts
                 }
             except Exception as e:
                 logger.error(f"Failed to generate question chart data: {str(e)}")
@@ -110,8 +134,7 @@ class InfraService:
             # Performance metrics
             try:
                 if self.performance_metrics_file.exists():
-                    with open(self.performance_metrics_file, 'r', encoding='utf-8') as f:
-                        metrics = orjson.loads(f.read())
+                    metrics = self._read_performance_metrics()
                     logger.info(f"Loaded {len(metrics)} performance metrics")
                     for metric in metrics[-10:]:  # Last 10 entries for brevity
                         chart_data["performance_metrics"]["timestamps"].append(metric["timestamp"])
@@ -148,19 +171,16 @@ class InfraService:
             }
 
     def get_local_metrics(self) -> LocalMetricsResponse:
-        """Retrieve locally collected metrics."""
+        """Retrieve metrics collected in memory since the last aggregation."""
         try:
-            with open(self.metrics_file, 'r') as f:
-                metrics = json.load(f)
-            
             average_latency = {}
-            for key, latencies in metrics["request_latency"].items():
-                average_latency[key] = sum(latencies) / len(latencies) if latencies else 0.0
+            for key, reservoir in list(middleware.LATENCIES.items()):
+                average_latency[key] = reservoir.total / reservoir.count if reservoir.count else 0.0
             
             return LocalMetricsResponse(
-                request_count=metrics["request_count"],
+                request_count=dict(middleware.REQUEST_COUNT),
                 average_latency=average_latency,
-                error_count=metrics["error_count"]
+                error_count=dict(middleware.ERROR_COUNT)
             ) 
         except Exception as e:
             logger.error(f"Failed to retrieve local metrics: {str(e)}")
@@ -173,9 +193,7 @@ class InfraService:
     def get_performance_metrics(self) -> List[PerformanceMetricsResponse]:
         """Retrieve aggregated performance metrics."""
         try:
-            with open(self.performance_metrics_file, 'r') as f:
-                metrics = json.load(f)
-            
+            metrics = self._read_performance_metrics()
             return [PerformanceMetricsResponse(**metric) for metric in metrics]
         except Exception as e:
             logger.error(f"Failed to retrieve performance metrics: {str(e)}")
@@ -1,10 +1,14 @@
-import random
+import itertools
+import logging
 import structlog
 import json
-from typing import List, Optional
-from app.questions import load_questions, QuizQuestion, get_goals_in_question_bank, count_questions_for_goal, append_questions_to_bank, question_cache, _validate_question_item
+import orjson
+import secrets
+import threading
+from typing import Dict, List, NamedTuple, Optional
+from app.questions import load_questions, QuizQuestion, get_goals_in_question_bank, count_questions_for_goal, append_questions_to_bank, _validate_question_item
 from app.utils.config_loader import CONFIG
-from app.api.models import QuestionResponse, GenerateQuestionsResponse, ConfigResponse, McqQuestionResponse, ShortAnswerQuestionResponse, GoalResponse
+from app.api.models import ConfigResponse, McqQuestionResponse, ShortAnswerQuestionResponse, GoalResponse
 from app.generators.tfidfRetrieval.tfidfGenerator import TfidfGenerator
 from app.generators.templateRetrieval.templateGenerator import QuestionTemplateGenerator
 from fastapi import HTTPException
@@ -13,15 +17,43 @@ from pathlib import Path
 
 logger = structlog.get_logger(__name__)
 
+# Sequential quiz ids: no RNG state to mutate per request and no collisions within a process.
+# The random per-process prefix keeps ids from different uvicorn workers apart
+_quiz_id_prefix = f"quiz_{secrets.token_hex(2)}"
+_quiz_counter = itertools.count(1)
+
+def _next_quiz_id() -> str:
+    return f"{_quiz_id_prefix}{next(_quiz_counter):08x}"
+
+class _BankView(NamedTuple):
+    """Everything built from one bank load. Reloads swap in a whole new view, so a request
+    that read the old one keeps a consistent generator, dicts and memo throughout."""
+    questions: List[QuizQuestion]
+    # id() of each bank question -> its response dict
+    response_dicts: Dict[int, Dict]
+    # Everything after quiz_id in the /questions body
+    questions_body_tail: bytes
+    retrieval: TfidfGenerator
+    # (goal, difficulty, num_questions) -> retrieval question dicts
+    retrieval_payloads: Dict[tuple, List[Dict]]
+
 class QuestionService:
     def __init__(self):
-        self.questions_cache = load_questions()
+        self.bank = self._build_bank(load_questions())
+        # Serializes bank reloads and goal changes within this worker: /goals runs in the
+        # threadpool and the refresher in its own thread, and both rewrite the bank view,
+        # CONFIG['supported_goals'] and the files. Readers just take self.bank as-is
+        self._lock = threading.Lock()
         self.default_generator_mode = CONFIG.get('generator_mode', 'retrieval')
         self.supported_generator_modes = CONFIG.get('supported_generator_modes', ['retrieval', 'template'])
+        self.supported_difficulties = frozenset(CONFIG['supported_difficulties'])
+        self._refresh_supported_goals()
+        # The retrieval generator is part of each bank view
         self.generators = {
-            "retrieval": TfidfGenerator(self.questions_cache),
             "template": QuestionTemplateGenerator()
         }
+        self._config_body = None
+        self._config_body_goals = None
         self.config_path = Path("config.json")
         self.schema_path = Path("schema.json")
         self.token_path = Path("api_tokens.json")
@@ -33,83 +65,118 @@ class QuestionService:
             logger.error(f"Failed to load API token: {str(e)}")
             raise ValueError("API token configuration missing or invalid")
 
+    def _reload_questions(self):
+        """Clear the question cache after a write to the bank and pick up the new load; hold self._lock."""
+        load_questions.cache_clear()
+        self._refresh_bank()
+
+    def refresh_bank(self):
+        """Swap in a new bank view if load_questions() has moved on to a different bank.
+
+        load_questions returns the same list while the file and supported goals are
+        unchanged, so this is a no-op until another worker (or this one) edits the bank.
+        """
+        with self._lock:
+            self._refresh_bank()
+
+    def _refresh_bank(self):
+        """refresh_bank without taking the lock; hold self._lock."""
+        questions = load_questions()
+        if questions is not self.bank.questions:
+            self.bank = self._build_bank(questions)
+            logger.info(f"Rebuilt question service for {len(questions)} questions")
+
+    def _refresh_supported_goals(self):
+        """Snapshot supported goals as a frozenset for O(1) request validation."""
+        self.supported_goals = frozenset(CONFIG.get('supported_goals', []))
+
+    def _build_bank(self, questions: List[QuizQuestion]) -> _BankView:
+        """Build the response dicts, /questions body and retrieval generator for a bank load."""
+        response_dicts = {id(q): self._to_response_dict(q) for q in questions}
+        body = orjson.dumps({
+            "goal": questions[0].goal if questions else "GATE",
+            "questions": list(response_dicts.values())
+        })
+        return _BankView(questions, response_dicts, b"," + body[1:], TfidfGenerator(questions), {})
+
+    def _question_dicts(self, questions: List[QuizQuestion], response_dicts: Dict[int, Dict]) -> List[Dict]:
+        """Response dicts for questions; bank questions reuse their prebuilt dicts."""
+        return [response_dicts.get(id(q)) or self._to_response_dict(q) for q in questions]
+
+    @staticmethod
+    def _to_response_dict(q: QuizQuestion) -> Dict:
+        """Convert a quiz question to its mcq / short answer response shape, as a plain dict."""
+        # Read fields straight off the question object in a single validation pass
+        model = McqQuestionResponse if q.type == 'mcq' else ShortAnswerQuestionResponse
+        return model.model_validate(q, from_attributes=True).model_dump()
+
     def display_questions(self, questions: List[QuizQuestion]):
         """Log answers for a list of questions."""
+        # Skip the loop entirely when INFO is filtered out for this module
+        if not logging.getLogger(__name__).isEnabledFor(logging.INFO):
+            return
         for q in questions:
-            logger.info(f"Answer: {q.answer}")
+            logger.info("Answer", answer=q.answer)
+
+    def get_all_questions_body(self) -> bytes:
+        """Serialized /questions body: only the fresh quiz_id is encoded per request."""
+        return b'{"quiz_id":' + orjson.dumps(_next_quiz_id()) + self.bank.questions_body_tail
 
-    def get_all_questions(self) -> GenerateQuestionsResponse:
-        """Retrieve all questions from the cache."""
-        questions = self.questions_cache
-        quiz_id = f"quiz_{random.randint(1000, 9999)}"
-        response_questions = [
-            McqQuestionResponse(
-                type=q.type,
-                question=q.question,
-                options=q.options,
-                answer=q.answer,
-                difficulty=q.difficulty,
-                topic=q.topic
-            ) if q.type == 'mcq' else ShortAnswerQuestionResponse(
-                type=q.type,
-                question=q.question,
-                answer=q.answer,
-                difficulty=q.difficulty,
-                topic=q.topic
-            ) for q in questions
-        ]
-        return GenerateQuestionsResponse(
-            quiz_id=quiz_id,
-            goal=questions[0].goal if questions else "GATE",
-            questions=response_questions
-        ) 
+    def _check_request(self, goal: str, difficulty: str, mode: str, bank: _BankView) -> str:
+        """Validate the request against config and return the generator mode to use."""
+        if not self.supported_goals:
+            raise HTTPException(status_code=500, detail="No supported goals available")
+        if goal not in self.supported_goals:
+            raise HTTPException(status_code=400, detail=f"Goal '{goal}' not in supported goals: {CONFIG.get('supported_goals', [])}")
+        if difficulty not in self.supported_difficulties:
+            raise HTTPException(status_code=400, detail=f"Difficulty must be one of {CONFIG['supported_difficulties']}")
+        
+        selected_mode = mode if mode else self.default_generator_mode
+        if selected_mode not in self.supported_generator_modes:
+            raise HTTPException(status_code=400, detail=f"Mode must be one of {self.supported_generator_modes}")
+        
+        if selected_mode == "retrieval" and not bank.questions:
+            raise HTTPException(status_code=500, detail="Question bank not available")
+        return selected_mode
 
-    def generate_quiz(self, goal: str, difficulty: str, num_questions: int, mode: str = None) -> GenerateQuestionsResponse:
-        """Generate a quiz based on goal, difficulty, number of questions, and mode."""
+    def generate_quiz_payload(self, goal: str, difficulty: str, num_questions: int, mode: str = None) -> Dict:
+        """Generate a quiz based on goal, difficulty, number of questions, and mode, as plain dicts ready for orjson."""
         try:
-            supported_goals = CONFIG.get('supported_goals', [])
-            if not supported_goals:
-                raise HTTPException(status_code=500, detail="No supported goals available")
-            if goal not in supported_goals:
-                raise HTTPException(status_code=400, detail=f"Goal '{goal}' not in supported goals: {supported_goals}")
-            if difficulty not in CONFIG['supported_difficulties']:
-                raise HTTPException(status_code=400, detail=f"Difficulty must be one of {CONFIG['supported_difficulties']}")
-            
-            selected_mode = mode if mode else self.default_generator_mode
-            if selected_mode not in self.supported_generator_modes:
-                raise HTTPException(status_code=400, detail=f"Mode must be one of {self.supported_generator_modes}")
-            
-            if selected_mode == "retrieval" and not self.questions_cache:
-                raise HTTPException(status_code=500, detail="Question bank not available")
-            
-            generator = self.generators[selected_mode]
-            questions = generator.generate(goal, difficulty, num_questions)
-            
-            response_questions = [
-                McqQuestionResponse(
-                    type=q.type,
-                    question=q.question,
-                    options=q.options,
-                    answer=q.answer,
-                    difficulty=q.difficulty,
-                    topic=q.topic
-                ) if q.type == 'mcq' else ShortAnswerQuestionResponse(
-                    type=q.type,
-                    question=q.question,
-                    answer=q.answer,
-                    difficulty=q.difficulty,
-                    topic=q.topic
-                ) for q in questions
-            ]
-            return GenerateQuestionsResponse(
-                quiz_id=f"quiz_{random.randint(1000, 9999)}",
-                goal=goal,
-                questions=response_questions
-            )
+            # Read the bank view once: a concurrent reload can't mix two loads in one request
+            bank = self.bank
+            selected_mode = self._check_request(goal, difficulty, mode, bank)
+            if selected_mode == "retrieval" and bank.retrieval.bucket_ranked:
+                # Retrieval results are fixed per bank load (TfidfGenerator ranks each bucket
+                # once), so the question list is memoized on the view until the next reload.
+                # Without rankings it samples at random, so those results aren't memoized
+                key = (goal, difficulty, num_questions)
+                questions = bank.retrieval_payloads.get(key)
+                if questions is None:
+                    questions = bank.retrieval_payloads[key] = self._question_dicts(
+                        bank.retrieval.generate(goal, difficulty, num_questions), bank.response_dicts)
+            else:
+                generator = bank.retrieval if selected_mode == "retrieval" else self.generators[selected_mode]
+                questions = self._question_dicts(
+                    generator.generate(goal, difficulty, num_questions), bank.response_dicts)
+            return {
+                "quiz_id": _next_quiz_id(),
+                "goal": goal,
+                "questions": questions
+            }
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
 
     def add_goal(self, goal: str, questions: Optional[List[QuizQuestion]] = None, api_token: str = None) -> GoalResponse:
+        """Add a goal or append questions to it; one goal change at a time per worker."""
+        with self._lock:
+            return self._add_goal(goal, questions, api_token)
+
+    def remove_goal(self, goal: str, api_token: str = None) -> GoalResponse:
+        """Remove a goal; one goal change at a time per worker."""
+        with self._lock:
+            return self._remove_goal(goal, api_token)
+
+    def _add_goal(self, goal: str, questions: Optional[List[QuizQuestion]] = None, api_token: str = None) -> GoalResponse:
         """Add a new goal to supported_goals or append questions if goal exists, update config.json and schema.json."""
         try:
             # Validate API token
@@ -124,10 +191,11 @@ class QuestionService:
                 for q in questions:
                     if q.goal != goal:
                         raise HTTPException(status_code=400, detail=f"Question goal '{q.goal}' does not match requested goal '{goal}'")
-                    # Convert to dict for validation
-                    q_dict = q.dict()
-                    validated_q = _validate_question_item(q_dict)
-                    validated_questions.append(QuizQuestion(**validated_q))
+                    # The request model already type-checked q; apply the bank rules and
+                    # construct without a second Pydantic validation pass. The goal being
+                    # added is not in supported_goals yet, so allow it explicitly
+                    validated_q = _validate_question_item(q.model_dump(), [*supported_goals, goal])
+                    validated_questions.append(QuizQuestion.model_construct(**validated_q))
             
             # Check question count
             existing_count = count_questions_for_goal(goal)
@@ -139,15 +207,17 @@ class QuestionService:
                 if not validated_questions:
                     raise HTTPException(status_code=400, detail=f"Goal '{goal}' already exists; provide questions to append")
                 append_questions_to_bank(validated_questions)
-                # Clear cache to reload updated question bank
-                question_cache.clear()
-                self.questions_cache = load_questions()
+                self._reload_questions()
                 logger.info(f"Appended {provided_count} questions for existing goal '{goal}' to question bank")
                 return GoalResponse(
                     message=f"Appended {provided_count} questions to existing goal '{goal}'",
                     supported_goals=supported_goals
                 )
             
+            # Check if goal exists in question bank or provided questions
+            if existing_count == 0 and provided_count == 0:
+                raise HTTPException(status_code=400, detail=f"Goal '{goal}' not found in question bank and no questions provided")
+            
             # For new goal, ensure minimum 10 questions
             if total_count < 10:
                 raise HTTPException(
@@ -155,16 +225,9 @@ class QuestionService:
                     detail=f"Goal '{goal}' has {total_count} questions (existing: {existing_count}, provided: {provided_count}); minimum 10 required"
                 )
             
-            # Check if goal exists in question bank or provided questions
-            if existing_count == 0 and provided_count == 0:
-                raise HTTPException(status_code=400, detail=f"Goal '{goal}' not found in question bank and no questions provided")
-            
             # Append questions to question bank
             if validated_questions:
                 append_questions_to_bank(validated_questions)
-                # Clear cache to reload updated question bank
-                question_cache.clear()
-                self.questions_cache = load_questions()
                 logger.info(f"Appended {provided_count} questions for goal '{goal}' to question bank")
             
             # Update config.json
@@ -175,20 +238,25 @@ class QuestionService:
                 with open(self.config_path, 'w', encoding='utf-8') as f:
                     json.dump(config_data, f, indent=4)
                 CONFIG['supported_goals'] = config_data['supported_goals']
+                self._refresh_supported_goals()
                 
                 # Update schema.json
                 self._update_schema_json()
             
+            # The bank only validates once the goal is supported, so reload after the config update
+            self._reload_questions()
             logger.info(f"Goal '{goal}' added to supported goals", supported_goals=CONFIG['supported_goals'])
             return GoalResponse(
                 message=f"Goal '{goal}' added successfully with {total_count} questions",
                 supported_goals=CONFIG['supported_goals']
             )
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Failed to add goal '{goal}'", error=str(e))
             raise HTTPException(status_code=500, detail=f"Failed to add goal: {str(e)}")
 
-    def remove_goal(self, goal: str, api_token: str = None) -> GoalResponse:
+    def _remove_goal(self, goal: str, api_token: str = None) -> GoalResponse:
         """Remove a goal from supported_goals, update config.json and schema.json."""
         try:
             # Validate API token
@@ -208,6 +276,7 @@ class QuestionService:
                 with open(self.config_path, 'w', encoding='utf-8') as f:
                     json.dump(config_data, f, indent=4)
                 CONFIG['supported_goals'] = config_data['supported_goals']
+                self._refresh_supported_goals()
                 
                 # Update schema.json
                 self._update_schema_json()
@@ -217,6 +286,8 @@ class QuestionService:
                 message=f"Goal '{goal}' removed successfully",
                 supported_goals=CONFIG['supported_goals']
             )
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Failed to remove goal '{goal}'", error=str(e))
             raise HTTPException(status_code=500, detail=f"Failed to remove goal: {str(e)}")
@@ -254,4 +325,12 @@ class QuestionService:
             return ConfigResponse(**config_data)
         except Exception as e:
             logger.error("Failed to retrieve configuration", error=str(e))
-            raise HTTPException(status_code=500, detail="Failed to retrieve configuration")
\ No newline at end of file
+            raise HTTPException(status_code=500, detail="Failed to retrieve configuration")
+
+    def get_config_body(self) -> bytes:
+        """Serialized /config body, rebuilt only when the supported goals change."""
+        goals = tuple(CONFIG.get("supported_goals", []))
+        if self._config_body is None or goals != self._config_body_goals:
+            self._config_body = orjson.dumps(self.get_config().model_dump())
+            self._config_body_goals = goals
+        return self._config_body
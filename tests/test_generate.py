@@ -1,25 +1,103 @@
 import unittest
-from unittest.mock import patch, mock_open
+from unittest.mock import patch
 from fastapi.testclient import TestClient
 from app.main import app
-from app.questions import QuizQuestion
-from app.api.models import GoalResponse
+from app.api.routes import get_question_service
+from app.questions import QuizQuestion, load_questions, append_questions_to_bank
+from app.services.question_service import QuestionService
+from app.generators.templateRetrieval.questionTemplates import solve_equation
+from app.generators.tfidfRetrieval.tfidfGenerator import TfidfGenerator
+from app.utils.config_loader import CONFIG
+from pathlib import Path
 import json
+import os
+import tempfile
+
+class BankTestCase(unittest.TestCase):
+    """Runs against real config.json, schema.json, api_tokens.json and bank files in a temp directory."""
+    api_token = "secure-token-123"
 
-class TestGoalsEndpoint(unittest.TestCase):
     def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        (self.root / "data").mkdir()
+        self.bank_path = self.root / "data" / CONFIG['DATASET']
+        # The service reads config.json, schema.json and api_tokens.json from the working directory
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        self.addCleanup(os.chdir, cwd)
+        # Restores DATA_DIR and any supported_goals a test or /goals call changed
+        config_patch = patch.dict(CONFIG, {'DATA_DIR': str(self.root / "data")})
+        config_patch.start()
+        self.addCleanup(config_patch.stop)
+        load_questions.cache_clear()
+        self.addCleanup(load_questions.cache_clear)
+        app.dependency_overrides[get_question_service] = lambda: self.service
+        self.addCleanup(app.dependency_overrides.clear)
         self.client = TestClient(app)
-        self.mock_questions = [
+
+    def write_bank(self, questions):
+        with open(self.bank_path, 'w', encoding='utf-8') as f:
+            json.dump([q.model_dump() for q in questions], f, indent=2)
+
+    def read_bank(self):
+        with open(self.bank_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def read_json(self, name):
+        with open(self.root / name, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def start_service(self, supported_goals, bank, bank_after_start=None):
+        """Write the config files and bank, then build the service.
+
+        bank_after_start, if given, replaces the bank once the service is running, as if
+        another worker had edited it: a bank holding goals that aren't supported yet
+        can't be loaded, so it can only appear this way.
+        """
+        config_data = {
+            "supported_goals": list(supported_goals),
+            "supported_difficulties": ["beginner", "intermediate", "advanced"],
+            "supported_types": ["mcq", "short_answer"],
+            "supported_generator_modes": ["retrieval", "template"],
+            "generator_mode": "retrieval"
+        }
+        schema_data = {
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "definitions": {
+                "inputRequest": {"properties": {"goal": {"enum": list(supported_goals)}}},
+                "outputResponse": {"properties": {"goal": {"enum": list(supported_goals)}}}
+            }
+        }
+        for name, data in (("config.json", config_data), ("schema.json", schema_data),
+                           ("api_tokens.json", {"api_token": self.api_token})):
+            with open(self.root / name, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4)
+        CONFIG['supported_goals'] = list(supported_goals)
+        self.write_bank(bank)
+        self.service = QuestionService()
+        if bank_after_start is not None:
+            self.write_bank(bank_after_start)
+
+    @staticmethod
+    def make_questions(goal, count, difficulty="beginner", prefix="Question"):
+        return [
             QuizQuestion(
                 type="mcq",
-                question=f"Question {i}",
+                question=f"{prefix} {i} about {goal}",
                 options=["A", "B", "C", "D"],
                 answer="A",
-                difficulty="beginner",
+                difficulty=difficulty,
                 topic="algorithms",
-                goal="New Goal"
-            ) for i in range(15)  # 15 questions for New Goal
-        ] + [
+                goal=goal
+            ) for i in range(count)
+        ]
+
+class TestGoalsEndpoint(BankTestCase):
+    def setUp(self):
+        super().setUp()
+        self.gate_questions = [
             QuizQuestion(
                 type="short_answer",
                 question=f"Short answer {i}",
@@ -50,389 +128,286 @@ class TestGoalsEndpoint(unittest.TestCase):
                 goal="New Goal"
             )
         ]
-        self.api_token = "secure-token-123"
-
-    @patch('app.questions.load_questions')
-    @patch('app.questions.get_goals_in_question_bank')
-    @patch('app.questions.count_questions_for_goal')
-    @patch('app.questions.append_questions_to_bank')
-    def test_add_goal_with_questions_success(self, mock_append, mock_count, mock_goals, mock_load_questions):
-        mock_load_questions.return_value = self.mock_questions
-        mock_goals.return_value = {"GATE", "New Goal"}
-        mock_count.return_value = 8  # 8 existing + 2 provided = 10
-        mock_config_data = {
-            "supported_goals": ["GATE", "Amazon SDE"],
-            "supported_difficulties": ["beginner", "intermediate", "advanced"],
-            "supported_types": ["mcq", "short_answer"],
-            "supported_generator_modes": ["retrieval", "template"],
-            "generator_mode": "retrieval"
-        }
-        mock_schema_data = {
-            "$schema": "http://json-schema.org/draft-07/schema#",
-            "definitions": {
-                "inputRequest": {"properties": {"goal": {"enum": ["GATE", "Amazon SDE"]}}},
-                "outputResponse": {"properties": {"goal": {"enum": ["GATE", "Amazon SDE"]}}}
+
+    def goal_count(self, goal):
+        return sum(1 for item in self.read_bank() if item['goal'] == goal)
+
+    def test_add_goal_with_questions_success(self):
+        # 8 existing + 2 provided = 10
+        self.start_service(["GATE", "Amazon SDE"], self.gate_questions,
+                           bank_after_start=self.gate_questions + self.make_questions("New Goal", 8))
+        response = self.client.post(
+            "/goals",
+            json={
+                "goal": "New Goal",
+                "action": "add",
+                "api_token": self.api_token,
+                "questions": [q.model_dump() for q in self.sample_questions]
             }
-        }
-        mock_token_data = {"api_token": self.api_token}
-        with patch('builtins.open', mock_open()) as mock_file:
-            mock_file.side_effect = [
-                mock_open(read_data=json.dumps(mock_config_data)).return_value,
-                mock_open().return_value,
-                mock_open(read_data=json.dumps(mock_token_data)).return_value
-            ]
-            with patch('app.services.question_service.Path.open', mock_open()) as mock_schema_file:
-                mock_schema_file.side_effect = [
-                    mock_open(read_data=json.dumps(mock_schema_data)).return_value,
-                    mock_open().return_value
-                ]
-                response = self.client.post(
-                    "/goals",
-                    json={
-                        "goal": "New Goal",
-                        "action": "add",
-                        "api_token": self.api_token,
-                        "questions": [q.dict() for q in self.sample_questions]
-                    }
-                )
+        )
         self.assertEqual(response.status_code, 200)
         data = response.json()
         self.assertEqual(data["message"], "Goal 'New Goal' added successfully with 10 questions")
         self.assertEqual(data["supported_goals"], ["GATE", "Amazon SDE", "New Goal"])
-        mock_append.assert_called_once()
-
-    @patch('app.questions.load_questions')
-    @patch('app.questions.get_goals_in_question_bank')
-    @patch('app.questions.count_questions_for_goal')
-    @patch('app.questions.append_questions_to_bank')
-    def test_add_questions_to_existing_goal(self, mock_append, mock_count, mock_goals, mock_load_questions):
-        mock_load_questions.return_value = self.mock_questions
-        mock_goals.return_value = {"GATE", "New Goal"}
-        mock_count.return_value = 15
-        mock_config_data = {
-            "supported_goals": ["GATE", "New Goal"],
-            "supported_difficulties": ["beginner", "intermediate", "advanced"],
-            "supported_types": ["mcq", "short_answer"],
-            "supported_generator_modes": ["retrieval", "template"],
-            "generator_mode": "retrieval"
-        }
-        mock_token_data = {"api_token": self.api_token}
-        with patch('builtins.open', mock_open()) as mock_file:
-            mock_file.side_effect = [
-                mock_open(read_data=json.dumps(mock_config_data)).return_value,
-                mock_open(read_data=json.dumps(mock_token_data)).return_value
-            ]
-            response = self.client.post(
-                "/goals",
-                json={
-                    "goal": "New Goal",
-                    "action": "add",
-                    "api_token": self.api_token,
-                    "questions": [q.dict() for q in self.sample_questions]
-                }
-            )
+        self.assertEqual(self.goal_count("New Goal"), 10)
+        self.assertEqual(self.read_json("config.json")["supported_goals"], ["GATE", "Amazon SDE", "New Goal"])
+        self.assertEqual(self.read_json("schema.json")["definitions"]["inputRequest"]["properties"]["goal"]["enum"],
+                         ["GATE", "Amazon SDE", "New Goal"])
+        # The service now serves the new goal's questions
+        self.assertEqual(len(self.service.bank.questions), 15)
+
+    def test_add_questions_to_existing_goal(self):
+        self.start_service(["GATE", "New Goal"], self.gate_questions + self.make_questions("New Goal", 15))
+        response = self.client.post(
+            "/goals",
+            json={
+                "goal": "New Goal",
+                "action": "add",
+                "api_token": self.api_token,
+                "questions": [q.model_dump() for q in self.sample_questions]
+            }
+        )
         self.assertEqual(response.status_code, 200)
         data = response.json()
         self.assertEqual(data["message"], "Appended 2 questions to existing goal 'New Goal'")
         self.assertEqual(data["supported_goals"], ["GATE", "New Goal"])
-        mock_append.assert_called_once()
-
-    @patch('app.questions.load_questions')
-    @patch('app.questions.get_goals_in_question_bank')
-    @patch('app.questions.count_questions_for_goal')
-    def test_add_goal_without_questions_success(self, mock_count, mock_goals, mock_load_questions):
-        mock_load_questions.return_value = self.mock_questions
-        mock_goals.return_value = {"GATE", "New Goal"}
-        mock_count.return_value = 15  # ≥10 existing questions
-        mock_config_data = {
-            "supported_goals": ["GATE", "Amazon SDE"],
-            "supported_difficulties": ["beginner", "intermediate", "advanced"],
-            "supported_types": ["mcq", "short_answer"],
-            "supported_generator_modes": ["retrieval", "template"],
-            "generator_mode": "retrieval"
-        }
-        mock_schema_data = {
-            "$schema": "http://json-schema.org/draft-07/schema#",
-            "definitions": {
-                "inputRequest": {"properties": {"goal": {"enum": ["GATE", "Amazon SDE"]}}},
-                "outputResponse": {"properties": {"goal": {"enum": ["GATE", "Amazon SDE"]}}}
+        self.assertEqual(self.goal_count("New Goal"), 17)
+        self.assertEqual(len(self.service.bank.questions), 22)
+
+    def test_add_goal_without_questions_success(self):
+        # ≥10 existing questions
+        self.start_service(["GATE", "Amazon SDE"], self.gate_questions,
+                           bank_after_start=self.gate_questions + self.make_questions("New Goal", 15))
+        response = self.client.post(
+            "/goals",
+            json={
+                "goal": "New Goal",
+                "action": "add",
+                "api_token": self.api_token
             }
-        }
-        mock_token_data = {"api_token": self.api_token}
-        with patch('builtins.open', mock_open()) as mock_file:
-            mock_file.side_effect = [
-                mock_open(read_data=json.dumps(mock_config_data)).return_value,
-                mock_open().return_value,
-                mock_open(read_data=json.dumps(mock_token_data)).return_value
-            ]
-            with patch('app.services.question_service.Path.open', mock_open()) as mock_schema_file:
-                mock_schema_file.side_effect = [
-                    mock_open(read_data=json.dumps(mock_schema_data)).return_value,
-                    mock_open().return_value
-                ]
-                response = self.client.post(
-                    "/goals",
-                    json={
-                        "goal": "New Goal",
-                        "action": "add",
-                        "api_token": self.api_token
-                    }
-                )
+        )
         self.assertEqual(response.status_code, 200)
         data = response.json()
         self.assertEqual(data["message"], "Goal 'New Goal' added successfully with 15 questions")
         self.assertEqual(data["supported_goals"], ["GATE", "Amazon SDE", "New Goal"])
+        self.assertEqual(len(self.service.bank.questions), 20)
 
-    @patch('app.questions.load_questions')
-    @patch('app.questions.get_goals_in_question_bank')
-    @patch('app.questions.count_questions_for_goal')
-    def test_add_goal_invalid_token(self, mock_count, mock_goals, mock_load_questions):
-        mock_load_questions.return_value = self.mock_questions
-        mock_goals.return_value = {"GATE", "New Goal"}
-        mock_count.return_value = 15
-        mock_config_data = {
-            "supported_goals": ["GATE", "Amazon SDE"],
-            "supported_difficulties": ["beginner", "intermediate", "advanced"],
-            "supported_types": ["mcq", "short_answer"],
-            "supported_generator_modes": ["retrieval", "template"],
-            "generator_mode": "retrieval"
-        }
-        mock_token_data = {"api_token": self.api_token}
-        with patch('builtins.open', mock_open()) as mock_file:
-            mock_file.side_effect = [
-                mock_open(read_data=json.dumps(mock_config_data)).return_value,
-                mock_open(read_data=json.dumps(mock_token_data)).return_value
-            ]
-            response = self.client.post(
-                "/goals",
-                json={
-                    "goal": "New Goal",
-                    "action": "add",
-                    "api_token": "invalid-token"
-                }
-            )
+    def test_add_goal_invalid_token(self):
+        self.start_service(["GATE", "Amazon SDE"], self.gate_questions)
+        response = self.client.post(
+            "/goals",
+            json={
+                "goal": "New Goal",
+                "action": "add",
+                "api_token": "invalid-token"
+            }
+        )
         self.assertEqual(response.status_code, 401)
         self.assertEqual(response.json()["detail"], "Invalid API token")
 
-    @patch('app.questions.load_questions')
-    @patch('app.questions.get_goals_in_question_bank')
-    @patch('app.questions.count_questions_for_goal')
-    def test_add_goal_insufficient_questions(self, mock_count, mock_goals, mock_load_questions):
-        mock_load_questions.return_value = self.mock_questions
-        mock_goals.return_value = {"GATE", "New Goal"}
-        mock_count.return_value = 5  # <10 questions
-        mock_config_data = {
-            "supported_goals": ["GATE", "Amazon SDE"],
-            "supported_difficulties": ["beginner", "intermediate", "advanced"],
-            "supported_types": ["mcq", "short_answer"],
-            "supported_generator_modes": ["retrieval", "template"],
-            "generator_mode": "retrieval"
-        }
-        mock_token_data = {"api_token": self.api_token}
-        with patch('builtins.open', mock_open()) as mock_file:
-            mock_file.side_effect = [
-                mock_open(read_data=json.dumps(mock_config_data)).return_value,
-                mock_open(read_data=json.dumps(mock_token_data)).return_value
-            ]
-            response = self.client.post(
-                "/goals",
-                json={
-                    "goal": "New Goal",
-                    "action": "add",
-                    "api_token": self.api_token,
-                    "questions": [self.sample_questions[0].dict()]  # Only 1 question
-                }
-            )
+    def test_add_goal_insufficient_questions(self):
+        # <10 questions
+        self.start_service(["GATE", "Amazon SDE"], self.gate_questions,
+                           bank_after_start=self.gate_questions + self.make_questions("New Goal", 5))
+        response = self.client.post(
+            "/goals",
+            json={
+                "goal": "New Goal",
+                "action": "add",
+                "api_token": self.api_token,
+                "questions": [self.sample_questions[0].model_dump()]  # Only 1 question
+            }
+        )
         self.assertEqual(response.status_code, 400)
         self.assertIn("Goal 'New Goal' has 6 questions (existing: 5, provided: 1); minimum 10 required", response.json()["detail"])
+        self.assertEqual(self.goal_count("New Goal"), 5)
 
-    @patch('app.questions.load_questions')
-    @patch('app.questions.get_goals_in_question_bank')
-    def test_add_goal_not_in_bank(self, mock_goals, mock_load_questions):
-        mock_load_questions.return_value = self.mock_questions
-        mock_goals.return_value = {"GATE"}
-        mock_config_data = {
-            "supported_goals": ["GATE"],
-            "supported_difficulties": ["beginner", "intermediate", "advanced"],
-            "supported_types": ["mcq", "short_answer"],
-            "supported_generator_modes": ["retrieval", "template"],
-            "generator_mode": "retrieval"
-        }
-        mock_token_data = {"api_token": self.api_token}
-        with patch('builtins.open', mock_open()) as mock_file:
-            mock_file.side_effect = [
-                mock_open(read_data=json.dumps(mock_config_data)).return_value,
-                mock_open(read_data=json.dumps(mock_token_data)).return_value
-            ]
-            response = self.client.post(
-                "/goals",
-                json={
-                    "goal": "Invalid Goal",
-                    "action": "add",
-                    "api_token": self.api_token
-                }
-            )
+    def test_add_goal_not_in_bank(self):
+        self.start_service(["GATE"], self.gate_questions)
+        response = self.client.post(
+            "/goals",
+            json={
+                "goal": "Invalid Goal",
+                "action": "add",
+                "api_token": self.api_token
+            }
+        )
         self.assertEqual(response.status_code, 400)
         self.assertIn("Goal 'Invalid Goal' not found in question bank and no questions provided", response.json()["detail"])
 
-    @patch('app.questions.load_questions')
-    @patch('app.questions.get_goals_in_question_bank')
-    def test_add_goal_invalid_question(self, mock_goals, mock_load_questions):
-        mock_load_questions.return_value = self.mock_questions
-        mock_goals.return_value = {"GATE", "New Goal"}
-        mock_config_data = {
-            "supported_goals": ["GATE"],
-            "supported_difficulties": ["beginner", "intermediate", "advanced"],
-            "supported_types": ["mcq", "short_answer"],
-            "supported_generator_modes": ["retrieval", "template"],
-            "generator_mode": "retrieval"
-        }
-        mock_token_data = {"api_token": self.api_token}
-        invalid_question = self.sample_questions[0].dict()
+    def test_add_goal_invalid_question(self):
+        self.start_service(["GATE"], self.gate_questions)
+        invalid_question = self.sample_questions[0].model_dump()
         invalid_question['options'] = ["A", "B"]  # Invalid: MCQ needs 4 options
-        with patch('builtins.open', mock_open()) as mock_file:
-            mock_file.side_effect = [
-                mock_open(read_data=json.dumps(mock_config_data)).return_value,
-                mock_open(read_data=json.dumps(mock_token_data)).return_value
-            ]
-            response = self.client.post(
-                "/goals",
-                json={
-                    "goal": "New Goal",
-                    "action": "add",
-                    "api_token": self.api_token,
-                    "questions": [invalid_question]
-                }
-            )
+        response = self.client.post(
+            "/goals",
+            json={
+                "goal": "New Goal",
+                "action": "add",
+                "api_token": self.api_token,
+                "questions": [invalid_question]
+            }
+        )
         self.assertEqual(response.status_code, 500)
         self.assertIn("Failed to add goal: mcq questions must have exactly 4 options", response.json()["detail"])
 
-    @patch('app.questions.load_questions')
-    @patch('app.questions.get_goals_in_question_bank')
-    def test_remove_goal_success(self, mock_goals, mock_load_questions):
-        mock_load_questions.return_value = []  # No questions with CAT
-        mock_goals.return_value = set()
-        mock_config_data = {
-            "supported_goals": ["GATE", "CAT"],
-            "supported_difficulties": ["beginner", "intermediate", "advanced"],
-            "supported_types": ["mcq", "short_answer"],
-            "supported_generator_modes": ["retrieval", "template"],
-            "generator_mode": "retrieval"
-        }
-        mock_schema_data = {
-            "$schema": "http://json-schema.org/draft-07/schema#",
-            "definitions": {
-                "inputRequest": {"properties": {"goal": {"enum": ["GATE", "CAT"]}}},
-                "outputResponse": {"properties": {"goal": {"enum": ["GATE", "CAT"]}}}
+    def test_remove_goal_success(self):
+        self.start_service(["GATE", "CAT"], [])  # No questions with CAT
+        response = self.client.post(
+            "/goals",
+            json={
+                "goal": "CAT",
+                "action": "remove",
+                "api_token": self.api_token
             }
-        }
-        mock_token_data = {"api_token": self.api_token}
-        with patch('builtins.open', mock_open()) as mock_file:
-            mock_file.side_effect = [
-                mock_open(read_data=json.dumps(mock_config_data)).return_value,
-                mock_open().return_value,
-                mock_open(read_data=json.dumps(mock_token_data)).return_value
-            ]
-            with patch('app.services.question_service.Path.open', mock_open()) as mock_schema_file:
-                mock_schema_file.side_effect = [
-                    mock_open(read_data=json.dumps(mock_schema_data)).return_value,
-                    mock_open().return_value
-                ]
-                response = self.client.post(
-                    "/goals",
-                    json={
-                        "goal": "CAT",
-                        "action": "remove",
-                        "api_token": self.api_token
-                    }
-                )
+        )
         self.assertEqual(response.status_code, 200)
         data = response.json()
         self.assertEqual(data["message"], "Goal 'CAT' removed successfully")
         self.assertEqual(data["supported_goals"], ["GATE"])
+        self.assertEqual(self.read_json("config.json")["supported_goals"], ["GATE"])
+        self.assertEqual(self.read_json("schema.json")["definitions"]["outputResponse"]["properties"]["goal"]["enum"], ["GATE"])
 
-    @patch('app.questions.load_questions')
-    def test_remove_goal_invalid_token(self, mock_load_questions):
-        mock_load_questions.return_value = []
-        mock_config_data = {
-            "supported_goals": ["GATE", "CAT"],
-            "supported_difficulties": ["beginner", "intermediate", "advanced"],
-            "supported_types": ["mcq", "short_answer"],
-            "supported_generator_modes": ["retrieval", "template"],
-            "generator_mode": "retrieval"
-        }
-        mock_token_data = {"api_token": self.api_token}
-        with patch('builtins.open', mock_open()) as mock_file:
-            mock_file.side_effect = [
-                mock_open(read_data=json.dumps(mock_config_data)).return_value,
-                mock_open(read_data=json.dumps(mock_token_data)).return_value
-            ]
-            response = self.client.post(
-                "/goals",
-                json={
-                    "goal": "CAT",
-                    "action": "remove",
-                    "api_token": "invalid-token"
-                }
-            )
+    def test_remove_goal_invalid_token(self):
+        self.start_service(["GATE", "CAT"], [])
+        response = self.client.post(
+            "/goals",
+            json={
+                "goal": "CAT",
+                "action": "remove",
+                "api_token": "invalid-token"
+            }
+        )
         self.assertEqual(response.status_code, 401)
         self.assertEqual(response.json()["detail"], "Invalid API token")
 
-    @patch('app.questions.load_questions')
-    def test_remove_goal_not_exists(self, mock_load_questions):
-        mock_load_questions.return_value = self.mock_questions
-        mock_config_data = {
-            "supported_goals": ["GATE"],
-            "supported_difficulties": ["beginner", "intermediate", "advanced"],
-            "supported_types": ["mcq", "short_answer"],
-            "supported_generator_modes": ["retrieval", "template"],
-            "generator_mode": "retrieval"
-        }
-        mock_token_data = {"api_token": self.api_token}
-        with patch('builtins.open', mock_open()) as mock_file:
-            mock_file.side_effect = [
-                mock_open(read_data=json.dumps(mock_config_data)).return_value,
-                mock_open(read_data=json.dumps(mock_token_data)).return_value
-            ]
-            response = self.client.post(
-                "/goals",
-                json={
-                    "goal": "Invalid Goal",
-                    "action": "remove",
-                    "api_token": self.api_token
-                }
-            )
+    def test_remove_goal_not_exists(self):
+        self.start_service(["GATE"], self.gate_questions)
+        response = self.client.post(
+            "/goals",
+            json={
+                "goal": "Invalid Goal",
+                "action": "remove",
+                "api_token": self.api_token
+            }
+        )
         self.assertEqual(response.status_code, 400)
         self.assertIn("Goal 'Invalid Goal' not in supported goals", response.json()["detail"])
 
-    @patch('app.questions.load_questions')
-    @patch('app.questions.get_goals_in_question_bank')
-    def test_remove_goal_in_bank(self, mock_goals, mock_load_questions):
-        mock_load_questions.return_value = self.mock_questions
-        mock_goals.return_value = {"GATE", "New Goal"}
-        mock_config_data = {
-            "supported_goals": ["GATE"],
-            "supported_difficulties": ["beginner", "intermediate", "advanced"],
-            "supported_types": ["mcq", "short_answer"],
-            "supported_generator_modes": ["retrieval", "template"],
-            "generator_mode": "retrieval"
-        }
-        mock_token_data = {"api_token": self.api_token}
-        with patch('builtins.open', mock_open()) as mock_file:
-            mock_file.side_effect = [
-                mock_open(read_data=json.dumps(mock_config_data)).return_value,
-                mock_open(read_data=json.dumps(mock_token_data)).return_value
-            ]
-            response = self.client.post(
-                "/goals",
-                json={
-                    "goal": "GATE",
-                    "action": "remove",
-                    "api_token": self.api_token
-                }
-            )
+    def test_remove_goal_in_bank(self):
+        self.start_service(["GATE"], self.gate_questions)
+        response = self.client.post(
+            "/goals",
+            json={
+                "goal": "GATE",
+                "action": "remove",
+                "api_token": self.api_token
+            }
+        )
         self.assertEqual(response.status_code, 400)
         self.assertIn("Cannot remove goal 'GATE' as it is still present in question bank", response.json()["detail"])
 
+class TestGenerateEndpoint(BankTestCase):
+    def setUp(self):
+        super().setUp()
+        self.start_service(["GATE"], self.make_questions("GATE", 12))
+        self.request = {"goal": "GATE", "difficulty": "beginner", "num_questions": 5, "mode": "retrieval"}
+
+    def test_retrieval_returns_memoized_payload(self):
+        bank = self.service.bank
+        with patch.object(bank.retrieval, 'generate', wraps=bank.retrieval.generate) as mock_generate:
+            first = self.client.post("/generate", json=self.request)
+            second = self.client.post("/generate", json=self.request)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 200)
+        mock_generate.assert_called_once()
+        memoized = bank.retrieval_payloads[("GATE", "beginner", 5)]
+        self.assertEqual(first.json()["questions"], memoized)
+        self.assertEqual(second.json()["questions"], memoized)
+        self.assertNotEqual(first.json()["quiz_id"], second.json()["quiz_id"])
+
+    def test_template_mode_is_not_memoized(self):
+        response = self.client.post("/generate", json={**self.request, "mode": "template"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["questions"]), 5)
+        self.assertEqual(self.service.bank.retrieval_payloads, {})
+
+class TestQuestionServiceReload(BankTestCase):
+    def setUp(self):
+        super().setUp()
+        self.start_service(["GATE"], self.make_questions("GATE", 12))
+
+    def question_count(self):
+        response = self.client.get("/questions")
+        self.assertEqual(response.status_code, 200)
+        return len(response.json()["questions"])
+
+    def test_refresh_picks_up_bank_written_elsewhere(self):
+        self.client.post("/generate", json={"goal": "GATE", "difficulty": "beginner", "num_questions": 5})
+        old_bank = self.service.bank
+        self.assertEqual(self.question_count(), 12)
+        # Another worker appends to the shared bank file
+        append_questions_to_bank(self.make_questions("GATE", 1, prefix="Appended"))
+        # Still the memoized load until the cache expires
+        self.service.refresh_bank()
+        self.assertEqual(self.question_count(), 12)
+        # What the lifespan refresher does every CACHE_TTL seconds
+        load_questions.cache_clear()
+        self.service.refresh_bank()
+        self.assertEqual(self.question_count(), 13)
+        self.assertIsNot(self.service.bank, old_bank)
+        self.assertEqual(self.service.bank.retrieval_payloads, {})
+
+    def test_refresh_keeps_view_for_unchanged_bank(self):
+        bank = self.service.bank
+        load_questions.cache_clear()
+        self.service.refresh_bank()
+        self.assertIs(self.service.bank, bank)
+
+class TestTfidfGenerator(unittest.TestCase):
+    def test_ranking_breaks_ties_by_highest_row_first(self):
+        questions = BankTestCase.make_questions("GATE", 6)
+        generator = TfidfGenerator(questions)
+        # Every question scores the same against the goal, as argsort(...)[::-1] used to order them
+        self.assertEqual(generator.generate("GATE", "beginner", 5), questions[::-1][:5])
+
+    def test_falls_back_to_sampling_when_fit_fails(self):
+        # Nothing but stop words: the vectorizer raises "empty vocabulary"
+        questions = [
+            QuizQuestion(type="mcq", question="which of them is it", options=["A", "B", "C", "D"],
+                         answer="A", difficulty="beginner", topic="the", goal="an")
+            for _ in range(6)
+        ]
+        generator = TfidfGenerator(questions)
+        self.assertEqual(generator.bucket_ranked, {})
+        selected = generator.generate("an", "beginner", 5)
+        self.assertEqual(len(selected), 5)
+        self.assertTrue(all(q in questions for q in selected))
+
+class TestSolveEquation(unittest.TestCase):
+    def test_matches_sympy_results(self):
+        # Outputs of the previous SymPy implementation (solve + evalf, sorted, rounded to 2 places)
+        expected = {
+            (1, 0, -4): "-2.0, 2.0",
+            (1, 2, 1): "-1.0",
+            (1, -5, 0): "0.0, 5.0",
+            (2, 0, 0): "0.0",
+            (1, 0, 0): "0.0",
+            (3, -5, 1): "0.23, 1.43",
+            (5, 5, -5): "-1.62, 0.62",
+            (2, -3, 1): "0.5, 1.0",
+            (1, 1, -1): "-1.62, 0.62",
+            (4, 4, 1): "-0.5",
+            (1, 5, 5): "-3.62, -1.38",
+            (5, -1, -5): "-0.9, 1.1",
+        }
+        for (a, b, c), answer in expected.items():
+            with self.subTest(a=a, b=b, c=c):
+                self.assertEqual(solve_equation(a, b, c), answer)
+
+    def test_complex_roots(self):
+        self.assertEqual(solve_equation(1, 0, 1), "0.0 - 1.0i, 0.0 + 1.0i")
+        self.assertEqual(solve_equation(2, -2, 1), "0.5 - 0.5i, 0.5 + 0.5i")
+
 if __name__ == '__main__':
-    unittest.main(verbosity=2)
\ No newline at end of file
+    unittest.main(verbosity=2)
@@ -0,0 +1,89 @@
+import unittest
+from unittest.mock import patch
+from app.questions import QuizQuestion, append_questions_to_bank, load_questions
+from app.utils.config_loader import CONFIG
+from pathlib import Path
+import json
+import tempfile
+
+class TestAppendQuestionsToBank(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.data_dir = Path(tmp.name)
+        self.bank_path = self.data_dir / CONFIG['DATASET']
+        config_patch = patch.dict(CONFIG, {'DATA_DIR': str(self.data_dir)})
+        config_patch.start()
+        self.addCleanup(config_patch.stop)
+        self.questions = [
+            QuizQuestion(
+                type="mcq",
+                question=f"Appended question {i}",
+                options=["A", "B", "C", "D"],
+                answer="A",
+                difficulty="beginner",
+                topic="algorithms",
+                goal="GATE"
+            ) for i in range(2)
+        ]
+        self.new_items = [q.model_dump() for q in self.questions]
+
+    def read_bank(self):
+        with open(self.bank_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_append_to_empty_array(self):
+        self.bank_path.write_text("[]\n", encoding='utf-8')
+        append_questions_to_bank(self.questions)
+        self.assertEqual(self.read_bank(), self.new_items)
+
+    def test_append_to_non_empty_array(self):
+        existing = [{"type": "short_answer", "question": "Existing question", "options": None,
+                     "answer": "42", "difficulty": "beginner", "topic": "general", "goal": "GATE"}]
+        original = json.dumps(existing, indent=2)
+        self.bank_path.write_text(original, encoding='utf-8')
+        append_questions_to_bank(self.questions)
+        self.assertEqual(self.read_bank(), existing + self.new_items)
+        # Spliced in before the closing bracket: the existing bytes are left untouched
+        self.assertTrue(self.bank_path.read_text(encoding='utf-8').startswith(original[:original.rindex("]")]))
+
+    def test_append_falls_back_for_missing_file(self):
+        append_questions_to_bank(self.questions)
+        self.assertEqual(self.read_bank(), self.new_items)
+
+    def test_append_falls_back_for_truncated_file(self):
+        self.bank_path.write_text('[\n  {"type": "mcq",', encoding='utf-8')
+        append_questions_to_bank(self.questions)
+        self.assertEqual(self.read_bank(), self.new_items)
+        # The rewrite goes through a temp file that is renamed over the bank
+        self.assertEqual(sorted(p.name for p in self.data_dir.iterdir() if not p.name.endswith(".lock")),
+                         [CONFIG['DATASET']])
+
+class TestLoadQuestions(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.bank_path = Path(tmp.name) / CONFIG['DATASET']
+        config_patch = patch.dict(CONFIG, {'DATA_DIR': tmp.name, 'supported_goals': ["GATE"]})
+        config_patch.start()
+        self.addCleanup(config_patch.stop)
+        load_questions.cache_clear()
+        self.addCleanup(load_questions.cache_clear)
+        self.item = {"type": "mcq", "question": "Which option is correct?", "options": ["A", "B", "C", "D"],
+                     "answer": "A", "difficulty": "beginner", "topic": "general", "goal": "GATE"}
+
+    def write_bank(self, items):
+        self.bank_path.write_text(json.dumps(items, indent=2), encoding='utf-8')
+
+    def test_load_valid_bank(self):
+        self.write_bank([self.item])
+        questions = load_questions()
+        self.assertEqual([q.model_dump() for q in questions], [self.item])
+
+    def test_load_rejects_non_string_options(self):
+        self.write_bank([{**self.item, "options": [1, 2, 3, 4]}])
+        with self.assertRaisesRegex(ValueError, "mcq options must be strings"):
+            load_questions()
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)